@@ -13,7 +13,7 @@ from src.processors.product_builder import ProductBuilder
 from src.processors.wc_formatter import WCFormatter
 from src.exporters.csv_exporter import CSVExporter
 from src.core.models.product import Product
-from src.utils.logger import get_logger, log_info, log_error, log_batch_progress
+from src.utils.logger import get_logger, log_info, log_error, log_batch_progress, batch_milestones
 
 
 class B2BWCConverter:
@@ -32,7 +32,7 @@ class B2BWCConverter:
         self.config = self._load_config(config_path)
         
         # Инициализируем компоненты
-        self.loader = XLSXLoader(config_path)
+        self.loader = XLSXLoader(config_path, config=self.config)
         self.builder = ProductBuilder(self.config)
         self.formatter = WCFormatter(self.config)
         self.exporter = CSVExporter(self.config)
@@ -111,22 +111,27 @@ class B2BWCConverter:
             # 2. Обработка пачек
             all_products = []
             
+            # Количество процессов сборки из конфига - одно на весь файл
+            build_workers = self.builder.get_build_workers()
+            
+            # Номера товаров для логирования прогресса: конец каждой пачки
+            total = len(df)
+            milestones = batch_milestones(total, len(batches[0])) if batches else frozenset()
+            
             for batch_idx, batch_df in enumerate(batches):
                 self.logger.info(f"🔨 Обработка пачки {batch_idx + 1}/{len(batches)}...")
                 
                 batch_products = self._process_batch(
                     batch_df=batch_df,
                     batch_idx=batch_idx,
-                    skip_images_download=skip_images_download
+                    skip_images_download=skip_images_download,
+                    build_workers=build_workers
                 )
                 
                 all_products.extend(batch_products)
                 
                 # Логирование прогресса
-                processed = len(all_products)
-                total = len(df)
-                percent = (processed / total) * 100
-                self.logger.info(f"📊 Прогресс: {processed}/{total} ({percent:.1f}%)")
+                log_batch_progress(len(all_products), total, milestones=milestones)
             
             # 3. Фильтруем успешные товары
             successful_products = [p for p in all_products if p is not None]
@@ -194,13 +199,17 @@ class B2BWCConverter:
             return results
         
         finally:
+            # Пулы процессов сборки и форматирования живут в пределах одного файла
+            self.builder.shutdown_workers()
+            self.exporter.formatter.shutdown_workers()
             self.stats["end_time"] = datetime.now()
     
     def _process_batch(
         self,
         batch_df,
         batch_idx: int,
-        skip_images_download: bool = True
+        skip_images_download: bool = True,
+        build_workers: Optional[int] = None
     ) -> List[Optional[Product]]:
         """
         Обработка одной пачки товаров
@@ -209,6 +218,8 @@ class B2BWCConverter:
             batch_df: DataFrame с данными пачки
             batch_idx: Индекс пачки
             skip_images_download: Пропустить скачивание изображений
+            build_workers: Количество процессов сборки
+                (None - из конфига processing.build_workers)
         
         Returns:
             Список товаров (None для неудачных)
@@ -219,14 +230,25 @@ class B2BWCConverter:
         if skip_images_download and hasattr(self.builder.parsers["images"], "skip_download"):
             self.builder.parsers["images"].skip_download = True
         
+        # Строки пачки в виде словарей - одним вызовом pandas, без создания
+        # Series на каждую строку (как при iterrows)
+        row_records = zip(batch_df.index, batch_df.to_dict("records"))
+        
+        # Сборка в пуле процессов (если включена в конфиге)
+        if build_workers is None:
+            build_workers = self.builder.get_build_workers()
+        if build_workers > 1:
+            rows = [
+                (row_dict, batch_idx * len(batch_df) + row_idx + 1)
+                for row_idx, row_dict in row_records
+            ]
+            return self.builder.build_from_rows(rows, build_workers)
+        
         # Обрабатываем каждую строку
-        for row_idx, row in batch_df.iterrows():
+        for row_idx, row_dict in row_records:
             global_row_idx = batch_idx * len(batch_df) + row_idx + 1
             
             try:
-                # Преобразуем строку в словарь
-                row_dict = row.to_dict()
-                
                 # Собираем товар
                 product = self.builder.build_from_row(row_dict, global_row_idx)
                 
@@ -234,7 +256,7 @@ class B2BWCConverter:
                 
                 # Логирование прогресса внутри пачки
                 if (row_idx + 1) % 10 == 0:
-                    self.logger.debug(f"Пачка {batch_idx + 1}: обработано {row_idx + 1}/{len(batch_df)} строк")
+                    self.logger.debug("Пачка %d: обработано %d/%d строк", batch_idx + 1, row_idx + 1, len(batch_df))
                 
             except Exception as e:
                 self.logger.error(f"Ошибка обработки строки {global_row_idx}: {e}")
@@ -6,7 +6,7 @@ from dataclasses import dataclass, field
 from typing import List, Dict, Optional  
 
 
-@dataclass
+@dataclass(slots=True)
 class Category:
     """
     Модель категории товаров
@@ -89,7 +89,7 @@ class Category:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class CategoryTree:
     """
     Дерево категорий для построения иерархии
@@ -7,7 +7,7 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class Product:
     """
     Модель товара для внутреннего представления
@@ -4,6 +4,7 @@
 
 import csv
 import json
+from itertools import islice
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 from datetime import datetime
@@ -14,6 +15,11 @@ from src.utils.logger import get_logger, log_info, log_error
 from src.utils.file_utils import ensure_dir_exists
 
 
+# Количество строк, передаваемых в writer.writerows за один вызов при
+# потоковой записи CSV (ограничивает память, сохраняя пакетную запись)
+CSV_WRITE_CHUNK_SIZE = 1000
+
+
 class CSVExporter:
     """
     Экспортер товаров в CSV для WooCommerce
@@ -65,10 +71,12 @@ class CSVExporter:
             return results
         
         try:
-            # 1. Форматируем товары для WC
-            formatted_rows = self.formatter.format_products_batch(products)
+            # 1. Форматируем товары для WC - потоково, порциями: в памяти
+            # одновременно находится только одна порция строк CSV
+            csv_rows = self.formatter.iter_format_products(products)
+            chunk = list(islice(csv_rows, CSV_WRITE_CHUNK_SIZE))
             
-            if not formatted_rows:
+            if not chunk:
                 results["errors"].append("Не удалось отформатировать товары")
                 return results
             
@@ -80,23 +88,46 @@ class CSVExporter:
             ensure_dir_exists(str(output_dir))
             
             # 4. Записываем CSV файл
-            with open(output_path, 'w', newline='', encoding=encoding) as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=headers, delimiter=',', quotechar='"')
+            formatted_count = 0
+            with open(output_path, 'w', newline='', encoding=encoding, buffering=1 << 20) as csvfile:
+                # Лишние поля строки отбрасываются, недостающие заполняются "" -
+                # проекция на заголовки выполняется самим DictWriter за один проход
+                writer = csv.DictWriter(
+                    csvfile, fieldnames=headers, delimiter=',', quotechar='"',
+                    restval="", extrasaction="ignore"
+                )
                 
                 if include_headers:
                     writer.writeheader()
                 
-                for row in formatted_rows:
+                while chunk:
+                    formatted_count += len(chunk)
+                    
+                    # Быстрый путь: вся порция одним вызовом, без обработки каждой строки
+                    chunk_start = csvfile.tell()
                     try:
-                        # Создаем строку только с нужными полями
-                        row_data = {field: row.get(field, "") for field in headers}
-                        writer.writerow(row_data)
-                        results["exported"] += 1
+                        writer.writerows(chunk)
+                        results["exported"] += len(chunk)
                         
-                    except Exception as e:
-                        results["failed"] += 1
-                        results["errors"].append(f"Ошибка записи строки: {str(e)}")
-                        self.logger.error(f"Ошибка записи в CSV: {e}")
+                    except Exception:
+                        # Откатываем частично записанные строки порции и пишем
+                        # по одной, чтобы пропустить только ошибочные и собрать ошибки
+                        csvfile.seek(chunk_start)
+                        csvfile.truncate()
+                        
+                        for row in chunk:
+                            try:
+                                writer.writerow(row)
+                                results["exported"] += 1
+                                
+                            except Exception as e:
+                                results["failed"] += 1
+                                results["errors"].append(f"Ошибка записи строки: {str(e)}")
+                                self.logger.error(f"Ошибка записи в CSV: {e}")
+                    
+                    chunk = list(islice(csv_rows, CSV_WRITE_CHUNK_SIZE))
+            
+            self.formatter.log_format_summary(formatted_count, len(products))
             
             # 5. Получаем размер файла
             file_size = Path(output_path).stat().st_size
@@ -3,6 +3,7 @@
 """
 
 import pandas as pd
+from importlib.util import find_spec
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 import json
@@ -11,6 +12,12 @@ from src.utils.logger import get_logger, log_error, log_info, log_warning
 from src.utils.validators import validate_required
 
 
+# Движок чтения XLSX: calamine (Rust, python-calamine из requirements.txt)
+# разбирает файл в разы быстрее openpyxl. Если пакет не установлен -
+# используется openpyxl (движок pandas по умолчанию)
+_EXCEL_ENGINE = "calamine" if find_spec("python_calamine") is not None else None
+
+
 class XLSXLoader:
     """
     Загрузчик и валидатор XLSX файлов
@@ -48,15 +55,20 @@ class XLSXLoader:
         "НС-код"
     ]
     
-    def __init__(self, config_path: str = "config/settings.json"):
+    def __init__(
+        self,
+        config_path: str = "config/settings.json",
+        config: Optional[Dict[str, Any]] = None
+    ):
         """
         Инициализация загрузчика
         
         Args:
             config_path: Путь к файлу конфигурации
+            config: Уже загруженная конфигурация (файл тогда не читается повторно)
         """
         self.logger = get_logger()
-        self.config = self._load_config(config_path)
+        self.config = config if config is not None else self._load_config(config_path)
         
     def _load_config(self, config_path: str) -> Dict[str, Any]:
         """Загрузка конфигурации"""
@@ -89,6 +101,7 @@ class XLSXLoader:
             # dtype=str - читаем все как текст
             df = pd.read_excel(
                 file_path,
+                engine=_EXCEL_ENGINE,
                 dtype=str,  # Все колонки как строки
                 na_filter=False  # Не заменяем пустые строки на NaN
             )
@@ -160,20 +173,25 @@ class XLSXLoader:
             "sample_data": {}
         }
         
+        # Маска заполненных ячеек и их количество по колонкам - для всей
+        # таблицы сразу, без фильтрации каждой колонки по отдельности
+        filled_mask = df.notna() & df.ne("")
+        filled_counts = filled_mask.sum()
+        
         # Анализируем каждую колонку
-        for column in df.columns:
-            col_data = df[column]
+        for column_idx, column in enumerate(df.columns):
+            non_null_count = int(filled_counts.iloc[column_idx])
+            null_count = len(df) - non_null_count
             
-            # Статистика по колонке
-            non_null = col_data[col_data.notna() & (col_data != "")]
-            null_count = len(df) - len(non_null)
+            # Примеры значений - первые 3 заполненные ячейки
+            sample_rows = filled_mask.iloc[:, column_idx].to_numpy().nonzero()[0][:3]
             
             analysis["columns_info"][column] = {
                 "total": len(df),
-                "non_null": len(non_null),
+                "non_null": non_null_count,
                 "null_count": null_count,
                 "null_percent": (null_count / len(df)) * 100 if len(df) > 0 else 0,
-                "sample_values": list(non_null.head(3).values) if len(non_null) > 0 else []
+                "sample_values": list(df.iloc[sample_rows, column_idx].values) if non_null_count > 0 else []
             }
             
             # Запоминаем колонки с пропусками
@@ -203,7 +221,9 @@ class XLSXLoader:
         total_rows = len(df)
         
         for i in range(0, total_rows, batch_size):
-            batch = df.iloc[i:i + batch_size].copy()
+            # Срез без .copy(): пачки только читаются, а копирование
+            # было бы вторым полным проходом по данным таблицы
+            batch = df.iloc[i:i + batch_size]
             batches.append(batch)
             
             self.logger.debug(f"Создана пачка {len(batches)}: строки {i+1}-{min(i+batch_size, total_rows)}")
@@ -9,7 +9,7 @@ from dataclasses import dataclass
 from src.utils.logger import get_logger
 
 
-@dataclass
+@dataclass(slots=True)
 class ParseResult:
     """
     Результат парсинга колонки
@@ -72,16 +72,12 @@ class BaseParser(ABC):
         if value is None:
             return ""
         
-        # Приводим к строке
-        value_str = str(value)
+        # Приводим к строке (строки - самый частый случай - без преобразования)
+        value_str = value if type(value) is str else str(value)
         
-        # Убираем лишние пробелы
-        value_str = value_str.strip()
-        
-        # Заменяем множественные пробелы на один
-        value_str = " ".join(value_str.split())
-        
-        return value_str
+        # Убираем лишние пробелы и заменяем множественные пробелы на один:
+        # split() без аргументов уже отбрасывает пробелы по краям
+        return " ".join(value_str.split())
     
     def create_result(self, 
                      data: Any, 
@@ -63,6 +63,12 @@ class BrandParser(BaseParser):
         'philips': 'Philips',
     }
     
+    # Предкомпилированные шаблоны поиска бренда как отдельного слова
+    _BRAND_KEYWORD_PATTERNS = tuple(
+        (keyword, re.compile(r'\b' + re.escape(keyword) + r'\b'), brand)
+        for keyword, brand in BRAND_KEYWORDS.items()
+    )
+    
     def __init__(self):
         """Инициализация парсера бренда"""
         super().__init__(column_name="Бренд")
@@ -157,14 +163,14 @@ class BrandParser(BaseParser):
                 return normalized
         
         # Если не нашли в словаре, применяем базовую нормализацию
-        # Убираем лишние пробелы
-        brand = " ".join(brand.split())
+        # Убираем лишние пробелы (слова используются и для капитализации)
+        words = brand.split()
+        brand = " ".join(words)
         
         # Капитализация: первая буква заглавная, остальные строчные
         # Но сохраняем аббревиатуры типа "BOSCH", "LG"
         if not brand.isupper():
             # Если не вся строка в верхнем регистре
-            words = brand.split()
             normalized_words = []
             
             for word in words:
@@ -199,11 +205,10 @@ class BrandParser(BaseParser):
         name_lower = product_name.lower()
         
         # Ищем ключевые слова брендов
-        for keyword, brand in self.BRAND_KEYWORDS.items():
+        for keyword, pattern, brand in self._BRAND_KEYWORD_PATTERNS:
             if keyword in name_lower:
                 # Проверяем что это отдельное слово, а не часть другого слова
-                pattern = r'\b' + re.escape(keyword) + r'\b'
-                if re.search(pattern, name_lower):
+                if pattern.search(name_lower):
                     return brand
         
         return None
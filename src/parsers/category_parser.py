@@ -9,6 +9,14 @@ from .base_parser import BaseParser, ParseResult
 from src.core.models.category import Category
 
 
+# Предкомпилированные регулярные выражения и таблицы
+_RE_HTML_TAG = re.compile(r'<[^>]+>')    # HTML теги
+_RE_DASHES = re.compile(r'\s*-+\s*')     # Дефисы (с пробелами вокруг)
+
+# Разные разделители категорий → стандартный "-"
+_CATEGORY_SEPARATORS_TABLE = str.maketrans({sep: '-' for sep in '–—>/\\|'})
+
+
 class CategoryParser(BaseParser):
     """
     Парсер для колонки "Название категории"
@@ -131,19 +139,14 @@ class CategoryParser(BaseParser):
             return ""
         
         # Убираем HTML теги
-        category_str = re.sub(r'<[^>]+>', '', category_str)
+        category_str = _RE_HTML_TAG.sub('', category_str)
         
-        # Заменяем разные разделители на стандартный "-"
-        # Поддерживаем: "-", "–", "—", ">", "/"
-        separators = ['–', '—', '>', '/', '\\', '|']
-        for sep in separators:
-            category_str = category_str.replace(sep, '-')
+        # Заменяем разные разделители на стандартный "-" (один проход)
+        # Поддерживаем: "-", "–", "—", ">", "/", "\\", "|"
+        category_str = category_str.translate(_CATEGORY_SEPARATORS_TABLE)
         
-        # Убираем множественные дефисы
-        category_str = re.sub(r'-+', '-', category_str)
-        
-        # Убираем пробелы вокруг дефисов
-        category_str = re.sub(r'\s*-\s*', '-', category_str)
+        # Убираем множественные дефисы и пробелы вокруг них
+        category_str = _RE_DASHES.sub('-', category_str)
         
         # Убираем лишние пробелы
         category_str = " ".join(category_str.split())
@@ -163,14 +166,13 @@ class CategoryParser(BaseParser):
         if not category_str:
             return []
         
-        # Разделяем по дефису
-        parts = [part.strip() for part in category_str.split('-') if part.strip()]
-        
-        # Очищаем каждый элемент
+        # Разделяем по дефису и очищаем каждый элемент за один проход
         cleaned_parts = []
-        for part in parts:
-            # Убираем лишние пробелы
+        for part in category_str.split('-'):
+            # Убираем лишние пробелы (split без аргументов отбрасывает и края)
             part = " ".join(part.split())
+            if not part:
+                continue
             
             # Убираем кавычки
             part = part.replace('"', '').replace("'", '')
@@ -197,10 +199,13 @@ class CategoryParser(BaseParser):
         if not hierarchy:
             return []
         
-        cleaned = []
-        for item in hierarchy:
-            if not cleaned or item != cleaned[-1]:
+        # Сравниваем только с последним добавленным элементом
+        cleaned = [hierarchy[0]]
+        last = hierarchy[0]
+        for item in hierarchy[1:]:
+            if item != last:
                 cleaned.append(item)
+                last = item
         
         return cleaned
     
@@ -2,11 +2,28 @@
 Парсер для сборки полного HTML описания товара
 """
 
+import re
 from typing import Dict, Any, List, Optional
 from .base_parser import BaseParser, ParseResult
 from src.utils.logger import log_info, log_warning
 
 
+# Обертки документа (<html>, <body>, <head>, DOCTYPE, XML-пролог) - удаляются
+# одним проходом по строке, контент внутри остается
+_RE_DOCUMENT_WRAPPERS = re.compile(
+    r'</?(?:html|body|head)>|<!DOCTYPE html>|<\?xml version="1\.0" encoding="UTF-8"\?>'
+)
+_RE_MANY_NL = re.compile(r'\n{3,}')  # 3+ переноса строки подряд
+_RE_HTML_TAG = re.compile(r'<[^>]+>')  # Любой HTML тег
+
+# Форматы ссылок YouTube (ID видео - 11 символов)
+_YOUTUBE_ID_PATTERNS = (
+    re.compile(r'(?:youtube\.com\/watch\?v=|youtu\.be\/)([a-zA-Z0-9_-]{11})'),
+    re.compile(r'youtube\.com\/embed\/([a-zA-Z0-9_-]{11})'),
+    re.compile(r'youtube\.com\/v\/([a-zA-Z0-9_-]{11})'),
+)
+
+
 class DescriptionParser(BaseParser):
     """
     Парсер для сборки полного HTML описания товара
@@ -137,23 +154,10 @@ class DescriptionParser(BaseParser):
         
         # Убираем теги <html>, <body>, <head> если они есть
         # Но оставляем контент внутри
-        replacements = [
-            ('<html>', ''),
-            ('</html>', ''),
-            ('<body>', ''),
-            ('</body>', ''),
-            ('<head>', ''),
-            ('</head>', ''),
-            ('<!DOCTYPE html>', ''),
-            ('<?xml version="1.0" encoding="UTF-8"?>', '')
-        ]
-        
-        for old, new in replacements:
-            html = html.replace(old, new)
+        html = _RE_DOCUMENT_WRAPPERS.sub('', html)
         
         # Убираем множественные переводы строк
-        import re
-        html = re.sub(r'\n{3,}', '\n\n', html)
+        html = _RE_MANY_NL.sub('\n\n', html)
         
         return html.strip()
     
@@ -202,16 +206,8 @@ class DescriptionParser(BaseParser):
         Returns:
             ID видео или None
         """
-        import re
-        
-        patterns = [
-            r'(?:youtube\.com\/watch\?v=|youtu\.be\/)([a-zA-Z0-9_-]{11})',
-            r'youtube\.com\/embed\/([a-zA-Z0-9_-]{11})',
-            r'youtube\.com\/v\/([a-zA-Z0-9_-]{11})'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, url)
+        for pattern in _YOUTUBE_ID_PATTERNS:
+            match = pattern.search(url)
             if match:
                 return match.group(1)
         
@@ -232,8 +228,7 @@ class DescriptionParser(BaseParser):
             return ""
         
         # Убираем HTML теги
-        import re
-        text_only = re.sub(r'<[^>]+>', '', article_html)
+        text_only = _RE_HTML_TAG.sub('', article_html)
         
         # Убираем лишние пробелы
         text_only = " ".join(text_only.split())
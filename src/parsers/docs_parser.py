@@ -8,7 +8,7 @@ from typing import Dict, List, Any, Optional, Tuple
 from urllib.parse import urlparse
 
 from .base_parser import BaseParser, ParseResult
-from src.utils.logger import log_info, log_warning
+from src.utils.logger import log_info, log_warning, log_debug
 
 
 class DocsParser(BaseParser):
@@ -132,7 +132,7 @@ class DocsParser(BaseParser):
                         }
                         total_links += len(urls)
                     
-                    log_info(f"Обработано {len(urls)} документов типа '{doc_type}'")
+                    log_debug("Обработано %d документов типа '%s'", len(urls), doc_type)
             
             # Генерируем полный HTML блок
             full_html = self._generate_full_html_block(processed_docs)
@@ -336,7 +336,8 @@ class DocsParser(BaseParser):
         
         # Формируем полное название
         # Берем первые 3 слова из названия товара чтобы не было слишком длинно
-        name_parts = product_name.split()[:3]
+        # (maxsplit: остаток названия на слова не разбивается)
+        name_parts = product_name.split(maxsplit=3)[:3]
         short_name = " ".join(name_parts)
         
         return f"{doc_name_ru} {short_name} ({file_type})"
@@ -7,11 +7,12 @@ import re
 from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 from urllib.parse import urlparse, unquote
+import cyrtranslit
 import requests
 
 from .base_parser import BaseParser, ParseResult
-from src.utils.file_utils import download_file, clean_filename, ensure_dir_exists
-from src.utils.logger import log_error, log_info, log_warning
+from src.utils.file_utils import download_files, clean_filename, ensure_dir_exists
+from src.utils.logger import log_debug, log_error, log_info, log_warning
 
 
 class ImagesParser(BaseParser):
@@ -140,6 +141,23 @@ class ImagesParser(BaseParser):
                     failed_urls.append(url)
                     log_warning(f"Не удалось обработать изображение {url}: {result.get('error', 'Unknown error')}")
             
+            # 3.1 Скачиваем изображения параллельно (если не пропущено)
+            if not self.skip_download and processed_images:
+                ensure_dir_exists(full_download_path)
+                download_results = download_files(
+                    [(img["url"], img["local_path"]) for img in processed_images]
+                )
+                
+                downloaded_images = []
+                for img, success in zip(processed_images, download_results):
+                    if success:
+                        downloaded_images.append(img)
+                        log_info(f"Скачано изображение {img['index']}: {img['filename']}")
+                    else:
+                        failed_urls.append(img["url"])
+                        log_warning(f"Не удалось обработать изображение {img['url']}: Не удалось скачать изображение")
+                processed_images = downloaded_images
+            
             # 4. Форматируем для WooCommerce
             wc_format = self._format_for_wc(processed_images, product_name)
             
@@ -256,8 +274,6 @@ class ImagesParser(BaseParser):
         
         # Очищаем название категории для использования в пути
         # Транслитерация и замена недопустимых символов
-        import cyrtranslit
-        
         try:
             category_slug = cyrtranslit.to_latin(category, 'ru')
         except:
@@ -319,22 +335,9 @@ class ImagesParser(BaseParser):
             # 3. Полный путь для сохранения
             local_path = os.path.join(download_path, filename)
             
-            # 4. Скачиваем изображение (если не пропущено)
-            if not self.skip_download:
-                # Создаем директорию если не существует
-                ensure_dir_exists(download_path)
-                
-                # Скачиваем файл
-                success = download_file(url, local_path)
-                if not success:
-                    result["error"] = "Не удалось скачать изображение"
-                    return result
-                
-                log_info(f"Скачано изображение {index}: {filename}")
-            else:
-                # Только имитация пути
-                local_path = os.path.join(download_path, filename)
-                log_info(f"Пропущено скачивание изображения {index}: {filename}")
+            # 4. Скачивание выполняется пачкой в parse() (если не пропущено)
+            if self.skip_download:
+                log_debug("Пропущено скачивание изображения %s: %s", index, filename)
             
             # 5. Генерируем путь для WC
             # Предполагаем что изображения будут загружены на сайт
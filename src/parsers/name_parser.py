@@ -9,6 +9,10 @@ import cyrtranslit
 from .base_parser import BaseParser, ParseResult
 
 
+# Слово для ключевых слов (буквы, цифры, дефис)
+_RE_WORD = re.compile(r'\b[\w-]+\b')
+
+
 class NameParser(BaseParser):
     """
     Парсер для колонки "Наименование"
@@ -19,6 +23,28 @@ class NameParser(BaseParser):
     3. Извлечение ключевых слов
     """
     
+    # Стоп-слова, исключаемые из ключевых слов
+    STOP_WORDS = frozenset({
+        'и', 'в', 'во', 'не', 'что', 'он', 'на', 'я', 'с', 'со', 'как', 'а',
+        'то', 'все', 'она', 'так', 'его', 'но', 'да', 'ты', 'к', 'у', 'же',
+        'вы', 'за', 'бы', 'по', 'только', 'ее', 'мне', 'было', 'вот', 'от',
+        'меня', 'еще', 'нет', 'о', 'из', 'ему', 'теперь', 'когда', 'даже',
+        'ну', 'ли', 'если', 'уже', 'или', 'ни', 'быть', 'был', 'него', 'до',
+        'вас', 'нибудь', 'опять', 'уж', 'вам', 'ведь', 'там', 'потом', 'себя',
+        'ничего', 'ей', 'может', 'они', 'тут', 'где', 'есть', 'надо', 'ней',
+        'для', 'мы', 'тебя', 'их', 'чем', 'была', 'сам', 'чтоб', 'без', 'будто',
+        'чего', 'раз', 'тоже', 'себе', 'под', 'будет', 'ж', 'тогда', 'кто',
+        'этот', 'того', 'потому', 'этого', 'какой', 'совсем', 'ним', 'здесь',
+        'этом', 'один', 'почти', 'мой', 'тем', 'чтобы', 'нее', 'сейчас', 'были',
+        'куда', 'зачем', 'всех', 'никогда', 'можно', 'при', 'наконец', 'два',
+        'об', 'другой', 'хоть', 'после', 'над', 'больше', 'тот', 'через',
+        'эти', 'нас', 'про', 'всего', 'них', 'какая', 'много', 'разве', 'три',
+        'эту', 'моя', 'впрочем', 'хорошо', 'свою', 'этой', 'перед', 'иногда',
+        'лучше', 'чуть', 'том', 'нельзя', 'такой', 'им', 'более', 'всегда',
+        'конечно', 'всю', 'между', 'для', 'ballu', 'тепловентилятор', 'конвектор',
+        'электрический', 'мини', 'настенный', 'напольный'
+    })
+    
     def __init__(self):
         """Инициализация парсера названия"""
         super().__init__(column_name="Наименование")
@@ -192,42 +218,16 @@ class NameParser(BaseParser):
         Returns:
             Список ключевых слов
         """
-        # Убираем стоп-слова
-        stop_words = {
-            'и', 'в', 'во', 'не', 'что', 'он', 'на', 'я', 'с', 'со', 'как', 'а',
-            'то', 'все', 'она', 'так', 'его', 'но', 'да', 'ты', 'к', 'у', 'же',
-            'вы', 'за', 'бы', 'по', 'только', 'ее', 'мне', 'было', 'вот', 'от',
-            'меня', 'еще', 'нет', 'о', 'из', 'ему', 'теперь', 'когда', 'даже',
-            'ну', 'ли', 'если', 'уже', 'или', 'ни', 'быть', 'был', 'него', 'до',
-            'вас', 'нибудь', 'опять', 'уж', 'вам', 'ведь', 'там', 'потом', 'себя',
-            'ничего', 'ей', 'может', 'они', 'тут', 'где', 'есть', 'надо', 'ней',
-            'для', 'мы', 'тебя', 'их', 'чем', 'была', 'сам', 'чтоб', 'без', 'будто',
-            'чего', 'раз', 'тоже', 'себе', 'под', 'будет', 'ж', 'тогда', 'кто',
-            'этот', 'того', 'потому', 'этого', 'какой', 'совсем', 'ним', 'здесь',
-            'этом', 'один', 'почти', 'мой', 'тем', 'чтобы', 'нее', 'сейчас', 'были',
-            'куда', 'зачем', 'всех', 'никогда', 'можно', 'при', 'наконец', 'два',
-            'об', 'другой', 'хоть', 'после', 'над', 'больше', 'тот', 'через',
-            'эти', 'нас', 'про', 'всего', 'них', 'какая', 'много', 'разве', 'три',
-            'эту', 'моя', 'впрочем', 'хорошо', 'свою', 'этой', 'перед', 'иногда',
-            'лучше', 'чуть', 'том', 'нельзя', 'такой', 'им', 'более', 'всегда',
-            'конечно', 'всю', 'между', 'для', 'ballu', 'тепловентилятор', 'конвектор',
-            'электрический', 'мини', 'настенный', 'напольный'
-        }
-        
-        # Разбиваем на слова
-        words = re.findall(r'\b[\w-]+\b', name.lower())
-        
-        # Фильтруем стоп-слова и короткие слова
-        keywords = [
-            word for word in words 
-            if (word not in stop_words and len(word) > 2 and not word.isdigit())
-        ]
-        
-        # Убираем дубли
+        # Фильтруем стоп-слова, короткие слова и дубли за один проход;
+        # останавливаемся, как только набрано максимальное количество
         unique_keywords = []
-        for word in keywords:
-            if word not in unique_keywords:
-                unique_keywords.append(word)
-        
-        # Ограничиваем количество
-        return unique_keywords[:10]
\ No newline at end of file
+        seen = set()
+        for word in _RE_WORD.findall(name.lower()):
+            if word in seen or word in self.STOP_WORDS or len(word) <= 2 or word.isdigit():
+                continue
+            seen.add(word)
+            unique_keywords.append(word)
+            if len(unique_keywords) == 10:
+                break
+        
+        return unique_keywords
\ No newline at end of file
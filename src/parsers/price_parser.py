@@ -9,6 +9,27 @@ from .base_parser import BaseParser, ParseResult
 from src.utils.validators import validate_price
 
 
+# Регулярные выражения для разных форматов цены (в порядке приоритета)
+_PRICE_PATTERNS = (
+    # Формат с пробелом тысяч и запятой десятичной: "1 190,00"
+    re.compile(r'(\d{1,3}(?:\s\d{3})*)[,.](\d{2})'),
+    
+    # Формат с точкой десятичной: "1190.00"
+    re.compile(r'(\d+)[.,](\d{2})'),
+    
+    # Формат без копеек: "1 190"
+    re.compile(r'(\d{1,3}(?:\s\d{3})*)'),
+    
+    # Просто число: "1190"
+    re.compile(r'(\d+)'),
+)
+
+# Валютные обозначения вместе с окружающими пробелами
+_RE_CURRENCY = re.compile(
+    r'\s*(?:руб\.?|rub\.?|rur\.?|р\.|₽|usd\.?|eur\.?|€|\$)\s*', re.IGNORECASE
+)
+
+
 class PriceParser(BaseParser):
     """
     Парсер для колонки "Цена"
@@ -30,20 +51,8 @@ class PriceParser(BaseParser):
         super().__init__(column_name="Цена")
         self.currency = currency
         
-        # Регулярные выражения для разных форматов цены
-        self.price_patterns = [
-            # Формат с пробелом тысяч и запятой десятичной: "1 190,00"
-            r'(\d{1,3}(?:\s\d{3})*)[,.](\d{2})',
-            
-            # Формат с точкой десятичной: "1190.00"
-            r'(\d+)[.,](\d{2})',
-            
-            # Формат без копеек: "1 190"
-            r'(\d{1,3}(?:\s\d{3})*)',
-            
-            # Просто число: "1190"
-            r'(\d+)',
-        ]
+        # Регулярные выражения для разных форматов цены (предкомпилированы)
+        self.price_patterns = _PRICE_PATTERNS
     
     def parse(self, value: str) -> ParseResult:
         """
@@ -191,7 +200,7 @@ class PriceParser(BaseParser):
         
         # Ищем числа в тексте
         for pattern in self.price_patterns:
-            match = re.search(pattern, text)
+            match = pattern.search(text)
             if match:
                 try:
                     # Обрабатываем найденное число
@@ -225,15 +234,7 @@ class PriceParser(BaseParser):
         if not price_str:
             return ""
         
-        # Убираем валютные обозначения
-        currency_patterns = [
-            r'\s*руб\.?\s*', r'\s*rub\.?\s*', r'\s*rur\.?\s*',
-            r'\s*р\.\s*', r'\s*₽\s*', r'\s*usd\.?\s*', r'\s*eur\.?\s*',
-            r'\s*€\s*', r'\s*\$\s*'
-        ]
-        
-        cleaned = price_str
-        for pattern in currency_patterns:
-            cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE)
+        # Убираем валютные обозначения (все варианты за один проход)
+        cleaned = _RE_CURRENCY.sub('', price_str)
         
         return cleaned.strip()
\ No newline at end of file
@@ -10,7 +10,23 @@ from .base_parser import BaseParser, ParseResult
 from src.utils.validators import validate_barcode
 
 
-@dataclass
+# Предкомпилированные регулярные выражения
+# HTML теги и кавычки за один проход (тег - как после удаления кавычек:
+# хотя бы один символ кроме кавычек между < и >)
+_RE_TAG_OR_QUOTE = re.compile(r'''<["']*[^>"'][^>]*>|["']''')
+
+# Ключи, которые могут содержать штрихкод
+_BARCODE_KEYS = ("штрихкод", "штрих код", "ean", "upc", "barcode", "код")
+_RE_BARCODE_KEY = re.compile('|'.join(map(re.escape, _BARCODE_KEYS)))
+
+# Единицы измерения, после которых убирается точка ("220 В." → "220 В")
+_UNITS_TO_CLEAN = ('В', 'кВт', 'Вт', 'Гц', 'кг', 'г', 'см', 'мм', 'м')
+_RE_UNIT_DOT = re.compile(
+    '(' + '|'.join(sorted(map(re.escape, _UNITS_TO_CLEAN), key=len, reverse=True)) + r')\.+'
+)
+
+
+@dataclass(slots=True)
 class SpecItem:
     """Элемент характеристики"""
     key: str  # Название характеристики
@@ -28,6 +44,70 @@ class SpecsParser(BaseParser):
     "ключ1: значение1; ключ2: значение2; ..."
     """
     
+    # Булевы слова (проверяются в начале/конце значения)
+    BOOL_WORDS = ('да', 'нет', 'yes', 'no', 'true', 'false', 'есть', 'отсутствует')
+    _BOOL_PREFIXES = tuple(word + ' ' for word in BOOL_WORDS)
+    _BOOL_SUFFIXES = tuple(' ' + word for word in BOOL_WORDS)
+    
+    # Русские булевы значения целиком: значение в нижнем регистре -> Да/Нет
+    _BOOL_CAPITALIZATION = {
+        'да': 'Да',
+        'нет': 'Нет',
+        'есть': 'Да',
+        'отсутствует': 'Нет',
+    }
+    
+    # Замены единиц измерения: (искомое, выражение для замены, замена)
+    _UNIT_REPLACEMENTS = tuple(
+        (old, re.compile(re.escape(old), re.IGNORECASE), new)
+        for old, new in (
+            ('квт', 'кВт'),
+            ('квт.', 'кВт'),
+            ('вт', 'Вт'),
+            ('вт.', 'Вт'),
+            ('вольт', 'В'),
+            ('вольт.', 'В'),  # Без точки после В
+            ('гц', 'Гц'),
+            ('гц.', 'Гц'),
+            ('герц', 'Гц'),
+            ('герц.', 'Гц'),
+            ('кг', 'кг'),
+            ('кг.', 'кг'),
+            ('гр', 'г'),
+            ('гр.', 'г'),
+            ('см', 'см'),
+            ('см.', 'см'),
+            ('мм', 'мм'),
+            ('мм.', 'мм'),
+            ('м', 'м'),
+            ('м.', 'м'),
+        )
+    )
+    
+    # Замены единиц измерения после пробела (для normalize_value)
+    _SPACED_UNIT_REPLACEMENTS = (
+        (' квт', ' кВт'),
+        (' квт.', ' кВт'),
+        (' вт', ' Вт'),
+        (' вт.', ' Вт'),
+        (' вольт', ' В'),
+        (' вольт.', ' В'),  # ← БЕЗ ТОЧКИ
+        (' гц', ' Гц'),
+        (' гц.', ' Гц'),
+        (' герц', ' Гц'),
+        (' герц.', ' Гц'),
+        (' кг', ' кг'),
+        (' кг.', ' кг'),
+        (' гр', ' г'),
+        (' гр.', ' г'),
+        (' см', ' см'),
+        (' см.', ' см'),
+        (' мм', ' мм'),
+        (' мм.', ' мм'),
+        (' м', ' м'),
+        (' м.', ' м'),
+    )
+    
     def __init__(self, main_attributes: Optional[List[str]] = None):
         """
         Инициализация парсера характеристик
@@ -97,6 +177,9 @@ class SpecsParser(BaseParser):
             # Формат с тире: "ключ - значение"
             r'([^-]+?)\s*-\s*([^;]+)(?=;|$)',
         ]
+        self._compiled_patterns = [
+            re.compile(pattern, re.IGNORECASE | re.DOTALL) for pattern in self.patterns
+        ]
     
     def parse(self, value: str) -> ParseResult:
         """
@@ -175,8 +258,8 @@ class SpecsParser(BaseParser):
             }
             
             # Логирование успеха
-            self.logger.debug(f"Распарсено характеристик: {len(specs_items)}, "
-                            f"основных: {len(main_attrs)}")
+            self.logger.debug("Распарсено характеристик: %d, основных: %d",
+                              len(specs_items), len(main_attrs))
             
             return self.create_result(
                 data=data,
@@ -208,10 +291,13 @@ class SpecsParser(BaseParser):
         specs_items = []
         
         # Пробуем разные паттерны для парсинга
-        for pattern in self.patterns:
-            matches = re.findall(pattern, specs_str, re.IGNORECASE | re.DOTALL)
+        for pattern in self._compiled_patterns:
+            matches = pattern.findall(specs_str)
             
             if matches:
+                # Уже добавленные ключи (пополняется по ходу, а не пересобирается)
+                existing_keys = set()
+                
                 for idx, (key, val) in enumerate(matches):
                     # Очищаем ключ и значение
                     key_clean = self._clean_key(key.strip())
@@ -219,8 +305,8 @@ class SpecsParser(BaseParser):
                     
                     if key_clean and val_clean:
                         # Проверяем, не дублируется ли ключ
-                        existing_keys = {item.key for item in specs_items}
                         if key_clean not in existing_keys:
+                            existing_keys.add(key_clean)
                             specs_items.append(SpecItem(
                                 key=key_clean,
                                 value=val_clean,
@@ -287,11 +373,8 @@ class SpecsParser(BaseParser):
         if not key:
             return ""
         
-        # Убираем кавычки
-        key = key.replace('"', '').replace("'", "")
-        
-        # Убираем HTML теги
-        key = re.sub(r'<[^>]+>', '', key)
+        # Убираем кавычки и HTML теги
+        key = _RE_TAG_OR_QUOTE.sub('', key)
         
         # Капитализация первой буквы
         if key and not key[0].isupper():
@@ -312,11 +395,8 @@ class SpecsParser(BaseParser):
         if not value:
             return ""
         
-        # Убираем кавычки
-        value = value.replace('"', '').replace("'", "")
-        
-        # Убираем HTML теги
-        value = re.sub(r'<[^>]+>', '', value)
+        # Убираем кавычки и HTML теги
+        value = _RE_TAG_OR_QUOTE.sub('', value)
         
         # Убираем точку с запятой в конце
         value = value.rstrip(';')
@@ -347,16 +427,17 @@ class SpecsParser(BaseParser):
             
             # 2. Проверяем булевы значения в начале/конце строки
             # Пример: "Да (с вилкой)" → "Да"
-            bool_words = ['да', 'нет', 'yes', 'no', 'true', 'false', 'есть', 'отсутствует']
-            for bool_word in bool_words:
-                if val_lower.startswith(bool_word + ' ') or val_lower.endswith(' ' + bool_word):
-                    if bool_word in self.normalization_map:
-                        item.normalized_value = self.normalization_map[bool_word]
-                        break
-                elif bool_word == val_lower:
-                    if bool_word in self.normalization_map:
-                        item.normalized_value = self.normalization_map[bool_word]
-                        break
+            # Быстрая проверка: startswith/endswith с кортежем - один вызов на уровне C
+            if val_lower.startswith(self._BOOL_PREFIXES) or val_lower.endswith(self._BOOL_SUFFIXES):
+                for bool_word in self.BOOL_WORDS:
+                    if val_lower.startswith(bool_word + ' ') or val_lower.endswith(' ' + bool_word):
+                        if bool_word in self.normalization_map:
+                            item.normalized_value = self.normalization_map[bool_word]
+                            break
+                    elif bool_word == val_lower:
+                        if bool_word in self.normalization_map:
+                            item.normalized_value = self.normalization_map[bool_word]
+                            break
             
             if item.normalized_value != original_value:
                 continue  # Уже нормализовали
@@ -365,37 +446,12 @@ class SpecsParser(BaseParser):
             # Пример: "1.5 квт" → "1.5 кВт"
             normalized_value = original_value
             
-            # Единицы измерения
-            unit_replacements = [
-                ('квт', 'кВт'),
-                ('квт.', 'кВт'),
-                ('вт', 'Вт'),
-                ('вт.', 'Вт'),
-                ('вольт', 'В'),
-                ('вольт.', 'В'),  # Без точки после В
-                ('гц', 'Гц'),
-                ('гц.', 'Гц'),
-                ('герц', 'Гц'),
-                ('герц.', 'Гц'),
-                ('кг', 'кг'),
-                ('кг.', 'кг'),
-                ('гр', 'г'),
-                ('гр.', 'г'),
-                ('см', 'см'),
-                ('см.', 'см'),
-                ('мм', 'мм'),
-                ('мм.', 'мм'),
-                ('м', 'м'),
-                ('м.', 'м'),
-            ]
-
             # Работаем с копией в нижнем регистре для поиска
             temp_lower = normalized_value.lower()
             
-            for old, new in unit_replacements:
+            for old, pattern, new in self._UNIT_REPLACEMENTS:
                 if old in temp_lower:
                     # Находим все вхождения
-                    pattern = re.compile(re.escape(old), re.IGNORECASE)
                     normalized_value = pattern.sub(new, normalized_value)
                     # Обновляем temp_lower для следующей итерации
                     temp_lower = normalized_value.lower()
@@ -412,30 +468,12 @@ class SpecsParser(BaseParser):
                 normalized_value = normalized_value.replace('no', 'Нет').replace('No', 'Нет')
             
             # 5. Капитализация "да" и "нет"
-            temp_lower = normalized_value.lower()
-            if temp_lower == 'да':
-                normalized_value = 'Да'
-            elif temp_lower == 'нет':
-                normalized_value = 'Нет'
-            elif temp_lower == 'есть':
-                normalized_value = 'Да'
-            elif temp_lower == 'отсутствует':
-                normalized_value = 'Нет'
+            normalized_value = self._BOOL_CAPITALIZATION.get(
+                normalized_value.lower(), normalized_value
+            )
             
             # 6. Убираем точку после единиц измерения (ФИКС ДЛЯ "220 В.")
-            # Сначала с пробелом, потом без пробела
-            units_to_clean = ['В', 'кВт', 'Вт', 'Гц', 'кг', 'г', 'см', 'мм', 'м']
-            
-            for unit in units_to_clean:
-                # Вариант с пробелом: " В." → " В"
-                with_space = f' {unit}.'
-                if with_space in normalized_value:
-                    normalized_value = normalized_value.replace(with_space, f' {unit}')
-                
-                # Вариант без пробела: "В." → "В"
-                without_space = f'{unit}.'
-                if without_space in normalized_value:
-                    normalized_value = normalized_value.replace(without_space, unit)
+            normalized_value = _RE_UNIT_DOT.sub(r'\1', normalized_value)
             
             item.normalized_value = normalized_value
         
@@ -453,10 +491,13 @@ class SpecsParser(BaseParser):
         """
         main_attrs = {}
         
+        # Имена основных атрибутов в нижнем регистре (один раз на вызов, а не на элемент)
+        main_attrs_lower = [main_attr.lower() for main_attr in self.main_attributes]
+        
         for item in items:
             # Проверяем, входит ли в основные атрибуты
-            is_main = any(main_attr.lower() in item.key.lower() 
-                         for main_attr in self.main_attributes)
+            key_lower = item.key.lower()
+            is_main = any(main_attr in key_lower for main_attr in main_attrs_lower)
             
             item.is_main_attribute = is_main
             
@@ -482,14 +523,11 @@ class SpecsParser(BaseParser):
             "key": ""
         }
         
-        # Ключи, которые могут содержать штрихкод
-        barcode_keys = ["штрихкод", "штрих код", "ean", "upc", "barcode", "код"]
-        
         for item in items:
             key_lower = item.key.lower()
             
-            # Проверяем, содержит ли ключ упоминание штрихкода
-            if any(barcode_key in key_lower for barcode_key in barcode_keys):
+            # Проверяем, содержит ли ключ упоминание штрихкода (один проход regex)
+            if _RE_BARCODE_KEY.search(key_lower):
                 barcode_info["found"] = True
                 barcode_info["value"] = item.value
                 barcode_info["key"] = item.key
@@ -609,39 +647,14 @@ class SpecsParser(BaseParser):
             return self.normalization_map[val_lower]
         
         # 2. Проверяем булевы значения
-        bool_words = ['да', 'нет', 'yes', 'no', 'true', 'false', 'есть', 'отсутствует']
-        for bool_word in bool_words:
+        for bool_word in self.BOOL_WORDS:
             if val_lower == bool_word and bool_word in self.normalization_map:
                 return self.normalization_map[bool_word]
         
         # 3. Проверяем единицы измерения
         normalized_value = original_value
         
-        # Единицы измерения
-        unit_replacements = [
-            (' квт', ' кВт'),
-            (' квт.', ' кВт'),
-            (' вт', ' Вт'),
-            (' вт.', ' Вт'),
-            (' вольт', ' В'),
-            (' вольт.', ' В'),  # ← БЕЗ ТОЧКИ
-            (' гц', ' Гц'),
-            (' гц.', ' Гц'),
-            (' герц', ' Гц'),
-            (' герц.', ' Гц'),
-            (' кг', ' кг'),
-            (' кг.', ' кг'),
-            (' гр', ' г'),
-            (' гр.', ' г'),
-            (' см', ' см'),
-            (' см.', ' см'),
-            (' мм', ' мм'),
-            (' мм.', ' мм'),
-            (' м', ' м'),
-            (' м.', ' м'),
-        ]
-        
-        for old, new in unit_replacements:
+        for old, new in self._SPACED_UNIT_REPLACEMENTS:
             if old in val_lower:
                 # Заменяем с сохранением регистра
                 if old in normalized_value.lower():
@@ -659,28 +672,9 @@ class SpecsParser(BaseParser):
             normalized_value = normalized_value.replace('no', 'Нет').replace('No', 'Нет')
         
         # 5. Капитализация русских булевых значений
-        if val_lower == 'да':
-            normalized_value = 'Да'
-        elif val_lower == 'нет':
-            normalized_value = 'Нет'
-        elif val_lower == 'есть':
-            normalized_value = 'Да'
-        elif val_lower == 'отсутствует':
-            normalized_value = 'Нет'
+        normalized_value = self._BOOL_CAPITALIZATION.get(val_lower, normalized_value)
         
         # 6. Убираем точку после единиц измерения (ДОБАВИТЬ ЭТО!)
-        # Сначала с пробелом, потом без пробела
-        units_to_clean = ['В', 'кВт', 'Вт', 'Гц', 'кг', 'г', 'см', 'мм', 'м']
-        
-        for unit in units_to_clean:
-            # Вариант с пробелом: " В." → " В"
-            with_space = f' {unit}.'
-            if with_space in normalized_value:
-                normalized_value = normalized_value.replace(with_space, f' {unit}')
-            
-            # Вариант без пробела: "В." → "В"
-            without_space = f'{unit}.'
-            if without_space in normalized_value:
-                normalized_value = normalized_value.replace(without_space, unit)
+        normalized_value = _RE_UNIT_DOT.sub(r'\1', normalized_value)
         
         return normalized_value
\ No newline at end of file
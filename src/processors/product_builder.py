@@ -2,30 +2,87 @@
 Сборщик товара - объединение данных от всех парсеров
 """
 
-from typing import Dict, Any, List, Optional
-from dataclasses import asdict
-import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Callable, Tuple
 
 from src.core.models.product import Product
 from src.core.models.category import Category
-from src.parsers.name_parser import NameParser
-from src.parsers.sku_parser import SKUParser
-from src.parsers.category_parser import CategoryParser
-from src.parsers.brand_parser import BrandParser
-from src.parsers.price_parser import PriceParser
-from src.parsers.specs_parser import SpecsParser
-from src.parsers.images_parser import ImagesParser
-from src.parsers.docs_parser import DocsParser
-from src.parsers.description_parser import DescriptionParser
 
 from src.utils.logger import get_logger, log_info, log_error, log_product_processed
 
 
+# Предкомпилированные регулярные выражения для slug
+_RE_SLUG_INVALID = re.compile(r'[^\w\s-]')   # Все кроме букв, цифр, пробелов и дефиса
+_RE_SLUG_SEPARATORS = re.compile(r'[-\s]+')  # Пробелы и дефисы подряд
+
+# Классы парсеров (импортируются лениво при создании первого сборщика)
+_PARSER_CLASSES: Optional[Dict[str, type]] = None
+
+
+def _get_parser_classes() -> Dict[str, type]:
+    """
+    Ленивый импорт классов парсеров
+    
+    Модули парсеров загружаются один раз на процесс и только тогда,
+    когда действительно создается ProductBuilder.
+    
+    Returns:
+        Словарь {ключ парсера: класс парсера}
+    """
+    global _PARSER_CLASSES
+    
+    if _PARSER_CLASSES is None:
+        from src.parsers.name_parser import NameParser
+        from src.parsers.sku_parser import SKUParser
+        from src.parsers.category_parser import CategoryParser
+        from src.parsers.brand_parser import BrandParser
+        from src.parsers.price_parser import PriceParser
+        from src.parsers.specs_parser import SpecsParser
+        from src.parsers.images_parser import ImagesParser
+        from src.parsers.docs_parser import DocsParser
+        from src.parsers.description_parser import DescriptionParser
+        
+        _PARSER_CLASSES = {
+            "name": NameParser,
+            "sku": SKUParser,
+            "category": CategoryParser,
+            "brand": BrandParser,
+            "price": PriceParser,
+            "specs": SpecsParser,
+            "images": ImagesParser,
+            "docs": DocsParser,
+            "description": DescriptionParser
+        }
+    
+    return _PARSER_CLASSES
+
+
 class ProductBuilder:
     """
     Сборщик товара - координатор всех парсеров
     """
     
+    # Шаги сборки по порядку и колонки, от которых они зависят
+    # (None - шаг выполняется всегда)
+    BUILD_STEPS = [
+        ("_parse_basic_fields", ("Наименование", "Штрих код", "Эксклюзив")),
+        ("_parse_category", ("Название категории",)),
+        ("_parse_brand", None),
+        ("_parse_price", ("Цена",)),
+        ("_parse_specs", ("Характеристики",)),
+        ("_parse_sku", None),
+        ("_parse_images", ("Изображение",)),
+        ("_parse_documents", None),
+        ("_build_description", None),
+    ]
+    
+    # Значения колонки "Эксклюзив", означающие "да" (в нижнем регистре)
+    YES_VALUES = frozenset(("да", "yes", "true", "1", "есть"))
+    
     def __init__(self, config: Dict[str, Any] = None):
         """
         Инициализация сборщика товара
@@ -37,22 +94,43 @@ class ProductBuilder:
         self.config = config or {}
         
         # Инициализируем все парсеры
+        parser_classes = _get_parser_classes()
         self.parsers = {
-            "name": NameParser(),
-            "sku": SKUParser(use_ns_code_as_sku=True),
-            "category": CategoryParser(),
-            "brand": BrandParser(),
-            "price": PriceParser(currency="RUB"),
-            "specs": SpecsParser(),
-            "images": ImagesParser(
+            "name": parser_classes["name"](),
+            "sku": parser_classes["sku"](use_ns_code_as_sku=True),
+            "category": parser_classes["category"](),
+            "brand": parser_classes["brand"](),
+            "price": parser_classes["price"](currency="RUB"),
+            "specs": parser_classes["specs"](),
+            "images": parser_classes["images"](
                 download_path="data/downloads/images",
                 max_images=5,
                 skip_download=True  # Пока пропускаем скачивание для тестов
             ),
-            "docs": DocsParser(),
-            "description": DescriptionParser()
+            "docs": parser_classes["docs"](),
+            "description": parser_classes["description"]()
         }
         
+        # Значения WC по умолчанию из конфига (разбираются один раз, а не на каждый товар).
+        # Ключи интернируются: строки из JSON совпадают с полями шаблона строки CSV
+        # по идентичности, и поиск в словарях не сравнивает их посимвольно
+        self._wc_default_values = tuple(
+            (sys.intern(key), value)
+            for key, value in self.config.get("wc", {}).get("default_values", {}).items()
+        )
+        
+        # Разбор категории по значению колонки: в каталоге тысячи товаров, но
+        # лишь десятки разных категорий, а CategoryParser не хранит состояния
+        self._parse_category_value = lru_cache(maxsize=4096)(self.parsers["category"].parse)
+        
+        # Планы сборки для уже встреченных схем колонок
+        self._schema_plans: Dict[frozenset, List[Callable]] = {}
+        
+        # Пул процессов сборки (создается при первом использовании и
+        # переиспользуется между пачками) и параметры, с которыми он создан
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_key: Optional[Tuple[int, bool]] = None
+        
         # Статистика
         self.stats = {
             "total_processed": 0,
@@ -61,6 +139,38 @@ class ProductBuilder:
             "errors": []
         }
     
+    def compile_for_schema(self, columns) -> List[Callable]:
+        """
+        Построение плана сборки для фиксированного набора колонок
+        
+        Шаги, все колонки которых отсутствуют в схеме, в план не попадают.
+        
+        Args:
+            columns: Набор колонок XLSX
+        
+        Returns:
+            Список методов-шагов в порядке выполнения
+        """
+        columns = frozenset(columns)
+        plan = []
+        
+        for method_name, required_columns in self.BUILD_STEPS:
+            if required_columns is None or not columns.isdisjoint(required_columns):
+                plan.append(getattr(self, method_name))
+        
+        return plan
+    
+    def _get_schema_plan(self, row: Dict[str, Any]) -> List[Callable]:
+        """Получение (с кешированием) плана сборки для схемы строки"""
+        schema = frozenset(row)
+        plan = self._schema_plans.get(schema)
+        
+        if plan is None:
+            plan = self.compile_for_schema(schema)
+            self._schema_plans[schema] = plan
+        
+        return plan
+    
     def build_from_row(self, row: Dict[str, Any], row_index: int) -> Optional[Product]:
         """
         Сборка товара из строки XLSX
@@ -72,38 +182,15 @@ class ProductBuilder:
         Returns:
             Объект Product или None при ошибке
         """
-        self.logger.info(f"🔨 Сборка товара из строки #{row_index}")
+        self.logger.debug("🔨 Сборка товара из строки #%s", row_index)
         
         try:
             # 1. Инициализируем базовый объект товара
             product = Product(id=row_index, source_row=row_index)
             
-            # 2. Парсим основные поля
-            self._parse_basic_fields(product, row)
-            
-            # 3. Парсим категорию
-            self._parse_category(product, row)
-            
-            # 4. Парсим бренд
-            self._parse_brand(product, row)
-            
-            # 5. Парсим цену
-            self._parse_price(product, row)
-            
-            # 6. Парсим характеристики
-            self._parse_specs(product, row)
-            
-            # 7. Парсим SKU/артикул
-            self._parse_sku(product, row)
-            
-            # 8. Парсим изображения
-            self._parse_images(product, row)
-            
-            # 9. Парсим документы
-            self._parse_documents(product, row)
-            
-            # 10. Собираем полное описание
-            self._build_description(product, row)
+            # 2-10. Парсим колонки по плану для схемы этой строки
+            for step in self._get_schema_plan(row):
+                step(product, row)
             
             # 11. Генерируем WC поля
             self._prepare_wc_fields(product)
@@ -132,6 +219,90 @@ class ProductBuilder:
             self.stats["errors"].append(f"Строка {row_index}: {str(e)}")
             return None
     
+    def get_build_workers(self, max_workers: Optional[int] = None) -> int:
+        """
+        Количество процессов для сборки
+        
+        Args:
+            max_workers: Явное значение (None - из конфига processing.build_workers)
+        
+        Returns:
+            Количество процессов (0 в конфиге - по числу ядер, 1 - без пула)
+        """
+        if max_workers is None:
+            max_workers = self.config.get("processing", {}).get("build_workers", 1)
+        
+        if max_workers == 0:
+            max_workers = os.cpu_count() or 1
+        
+        return max_workers
+    
+    def build_from_rows(
+        self,
+        rows: List[Tuple[Dict[str, Any], int]],
+        max_workers: Optional[int] = None
+    ) -> List[Optional[Product]]:
+        """
+        Сборка нескольких товаров, при необходимости в пуле процессов
+        
+        Каждый процесс пула один раз создает собственный сборщик с той же
+        конфигурацией и собирает им все свои строки. Пул сохраняется между
+        вызовами (см. shutdown_workers). Статистика процессов суммируется
+        в статистику этого сборщика.
+        
+        Args:
+            rows: Список пар (словарь строки, индекс строки)
+            max_workers: Количество процессов для сборки
+                (None - из конфига processing.build_workers, 0 - по числу ядер,
+                1 - без пула)
+        
+        Returns:
+            Список товаров (None для неудачных) в порядке строк
+        """
+        max_workers = self.get_build_workers(max_workers)
+        
+        if max_workers <= 1 or len(rows) <= 1:
+            return [self.build_from_row(row, row_index) for row, row_index in rows]
+        
+        executor = self._get_executor(max_workers)
+        
+        # Несколько порций на процесс: пачка распределяется по всем процессам,
+        # но строки передаются не по одной
+        chunksize = max(1, min(128, len(rows) // (max_workers * 4)))
+        
+        products = []
+        for product, stats in executor.map(_build_row_in_worker, rows, chunksize=chunksize):
+            products.append(product)
+            self.stats["total_processed"] += stats["total_processed"]
+            self.stats["successful"] += stats["successful"]
+            self.stats["failed"] += stats["failed"]
+            self.stats["errors"].extend(stats["errors"])
+        
+        return products
+    
+    def _get_executor(self, max_workers: int) -> ProcessPoolExecutor:
+        """Получение (с созданием при необходимости) пула процессов сборки"""
+        skip_download = getattr(self.parsers["images"], "skip_download", True)
+        executor_key = (max_workers, skip_download)
+        
+        if self._executor is None or self._executor_key != executor_key:
+            self.shutdown_workers()
+            self._executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_build_worker,
+                initargs=(self.config, skip_download)
+            )
+            self._executor_key = executor_key
+        
+        return self._executor
+    
+    def shutdown_workers(self):
+        """Остановка пула процессов сборки (если он был создан)"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+            self._executor_key = None
+    
     def _parse_basic_fields(self, product: Product, row: Dict[str, Any]):
         """Парсинг основных полей"""
         # Наименование
@@ -150,14 +321,15 @@ class ProductBuilder:
         # Эксклюзив
         if "Эксклюзив" in row:
             exclusive_val = str(row["Эксклюзив"]).strip().lower()
-            product.exclusive = exclusive_val in ["да", "yes", "true", "1", "есть"]
+            product.exclusive = exclusive_val in self.YES_VALUES
     
     def _parse_category(self, product: Product, row: Dict[str, Any]):
         """Парсинг категории"""
         if "Название категории" in row:
-            category_result = self.parsers["category"].parse(row["Название категории"])
+            category_result = self._parse_category_value(row["Название категории"])
             if category_result.success and category_result.data:
-                product.category_hierarchy = category_result.data["hierarchy"]
+                # Копия: результат разбора общий для всех товаров категории
+                product.category_hierarchy = list(category_result.data["hierarchy"])
                 
                 # Сохраняем объекты категорий
                 if "categories" in category_result.data:
@@ -295,10 +467,9 @@ class ProductBuilder:
         product.wc_fields["post_name"] = product.wc_slug
         
         # Статусы и типы (из конфига)
-        default_values = self.config.get("wc", {}).get("default_values", {})
-        for key, value in default_values.items():
-            if key not in product.wc_fields:  # Не перезаписываем установленные поля
-                product.wc_fields[key] = value
+        wc_fields = product.wc_fields
+        for key, value in self._wc_default_values:
+            wc_fields.setdefault(key, value)  # Не перезаписываем установленные поля
         
         # Категория и бренд уже установлены
         # SKU и цена уже установлены
@@ -307,19 +478,28 @@ class ProductBuilder:
         
         # Атрибуты из характеристик
         for attr_key, attr_value in product.main_attributes.items():
-            wc_attr_key = f"attribute:pa_{self._slugify(attr_key)}"
-            product.wc_fields[wc_attr_key] = attr_value
+            product.wc_fields[self._attribute_field_name(attr_key)] = attr_value
         
         # Штрихкод
         if product.barcode_clean:
             product.wc_fields["_barcode"] = product.barcode_clean
     
-    def _slugify(self, text: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _attribute_field_name(attr_key: str) -> str:
+        """
+        Поле WC для атрибута ("Цвет корпуса" -> "attribute:pa_цвет-корпуса")
+        
+        Результат кешируется: имена характеристик повторяются от товара к товару.
+        """
+        return sys.intern(f"attribute:pa_{ProductBuilder._slugify(attr_key)}")
+    
+    @staticmethod
+    def _slugify(text: str) -> str:
         """Простая генерация slug"""
-        import re
         slug = text.lower().strip()
-        slug = re.sub(r'[^\w\s-]', '', slug)
-        slug = re.sub(r'[-\s]+', '-', slug)
+        slug = _RE_SLUG_INVALID.sub('', slug)
+        slug = _RE_SLUG_SEPARATORS.sub('-', slug)
         return slug.strip('-')
     
     def get_stats(self) -> Dict[str, Any]:
@@ -340,6 +520,39 @@ class ProductBuilder:
         }
 
 
+# Сборщик процесса пула (создается инициализатором один раз на процесс)
+_worker_builder: Optional[ProductBuilder] = None
+
+
+def _init_build_worker(config: Dict[str, Any], skip_download: bool):
+    """
+    Инициализация процесса пула сборки
+    
+    Args:
+        config: Конфигурация сборщика
+        skip_download: Пропускать скачивание изображений
+    """
+    global _worker_builder
+    
+    _worker_builder = ProductBuilder(config)
+    _worker_builder.parsers["images"].skip_download = skip_download
+
+
+def _build_row_in_worker(job: Tuple[Dict[str, Any], int]) -> Tuple[Optional[Product], Dict[str, Any]]:
+    """
+    Сборка товара в процессе пула
+    
+    Args:
+        job: Пара (словарь строки, индекс строки)
+    
+    Returns:
+        Кортеж (товар или None, статистика сборки этой строки)
+    """
+    _worker_builder.reset_stats()
+    product = _worker_builder.build_from_row(*job)
+    return product, _worker_builder.stats
+
+
 # Функция для быстрого использования
 def build_product_from_dict(row_data: Dict[str, Any], config: Dict[str, Any] = None) -> Optional[Product]:
     """
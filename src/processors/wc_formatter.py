@@ -2,14 +2,72 @@
 Форматирование товара для WooCommerce CSV импорта
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields as dataclass_fields
 from datetime import datetime
+from functools import lru_cache, partial
+from operator import attrgetter
+import csv
+import hashlib
 import json
+import re
+import sys
+import time
 
 from src.core.models.product import Product
 from src.utils.logger import get_logger
 
 
+# Предкомпилированные регулярные выражения
+_RE_MANY_NL = re.compile(r'\n{3,}')         # 3+ переноса строки подряд
+_RE_NONWORD = re.compile(r'[^\w\s-]')       # Все кроме букв, цифр, пробелов и дефиса
+_RE_SEP = re.compile(r'[-\s]+')             # Пробелы и дефисы
+_RE_DBLDASH = re.compile(r'--+')            # Двойные дефисы
+_RE_NUM = re.compile(r'(\d+\.?\d*)')        # Первое число в строке
+_RE_CSV_SPECIAL = re.compile(r'[,"\n\r]')   # Символы, требующие кавычек в CSV
+_RE_CAT_SEP = re.compile(r'[-–—/\\|]')      # Нестандартные разделители категорий
+_RE_CAT_MULTI = re.compile(r'(?:\s*>\s*){2,}')  # Несколько " > " подряд
+_RE_HTML_ENTITY = re.compile(r'&(?:nbsp|plusmn|deg);')  # Заменяемые HTML-сущности
+
+# Замены HTML-сущностей (остальные сущности, например &lt; и &amp;,
+# остаются как есть - это часть HTML разметки описаний)
+_HTML_ENTITIES = {'&nbsp;': ' ', '&plusmn;': '±', '&deg;': '°'}
+
+# Таблица транслитерации кириллицы (упрощенная) для str.translate
+_TRANSLIT_TABLE = str.maketrans({
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd',
+    'е': 'e', 'ё': 'e', 'ж': 'zh', 'з': 'z', 'и': 'i',
+    'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n',
+    'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't',
+    'у': 'u', 'ф': 'f', 'х': 'h', 'ц': 'ts', 'ч': 'ch',
+    'ш': 'sh', 'щ': 'sch', 'ъ': '', 'ы': 'y', 'ь': '',
+    'э': 'e', 'ю': 'yu', 'я': 'ya',
+})
+
+
+@lru_cache(maxsize=4096)
+def _first_number(text: str) -> Optional[str]:
+    """
+    Первое число в строке или None
+    
+    Результат кешируется: значения веса и габаритов ("1.5 кг", "20 см")
+    повторяются от товара к товару.
+    """
+    match = _RE_NUM.search(text)
+    return match.group(1) if match else None
+
+
+def _short_hash(text: str) -> str:
+    """
+    Короткий детерминированный хеш строки (6 hex-символов)
+    
+    В отличие от встроенного hash() не зависит от PYTHONHASHSEED,
+    поэтому slug стабилен между запусками.
+    """
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=3).hexdigest()
+
+
 class WCFormatter:
     """
     Форматирование данных товара для WooCommerce CSV
@@ -50,6 +108,53 @@ class WCFormatter:
         "_exclusive",           # Эксклюзивный товар
     ]
     
+    # Множество стандартных полей для быстрой проверки принадлежности
+    _WC_FIELDS_SET = frozenset(WC_CSV_FIELDS)
+    
+    # Имена полей модели Product (набор фиксирован, рефлексия не нужна)
+    _PRODUCT_FIELDS = frozenset(f.name for f in dataclass_fields(Product))
+    
+    # Шаблон пустой строки CSV (копируется для каждого товара). Ключи
+    # интернированы, как и ключи wc_fields из конфига (см. ProductBuilder)
+    _EMPTY_ROW_TEMPLATE = dict.fromkeys(map(sys.intern, WC_CSV_FIELDS), "")
+    
+    # Вес и габариты: (характеристика товара, поле WC). В WC длина = глубина
+    _DIMENSION_FIELDS = (
+        ("Масса товара (нетто)", "weight"),
+        ("Ширина товара", "width"),
+        ("Высота товара", "height"),
+        ("Глубина товара", "length"),
+    )
+    
+    # Обязательные поля: (поле WC, атрибут Product, форматирование значения)
+    _REQUIRED_FILLERS = (
+        ("post_title", "name", None),
+        ("post_name", "wc_slug", None),
+        ("post_content", "description_final", None),
+        ("sku", "sku", None),
+        ("regular_price", "price", "{:.2f}".format),
+        ("tax:product_cat", "category_hierarchy", " > ".join),
+        ("tax:product_brand", "brand", None),
+    )
+    
+    # Обязательные для импорта поля: (поле WC, описание)
+    _REQUIRED_WC_FIELDS = (
+        ("post_title", "Название товара"),
+        ("sku", "SKU"),
+        ("regular_price", "Цена"),
+        ("post_content", "Описание"),
+    )
+    _REQUIRED_WC_FIELD_NAMES = tuple(field for field, _ in _REQUIRED_WC_FIELDS)
+    
+    # Поля, без которых строка считается неполной после форматирования:
+    # (поле WC, атрибут Product, форматирование значения)
+    _ROW_CHECK_FILLERS = (
+        ("post_title", "name", None),
+        ("sku", "sku", None),
+        ("regular_price", "price", "{:.2f}".format),
+    )
+    _ROW_CHECK_FIELDS = tuple(field for field, _, _ in _ROW_CHECK_FILLERS)
+    
     # Дополнительные атрибуты (будут добавлены динамически)
     ATTRIBUTE_FIELDS = [
         "attribute:pa_цвет-корпуса",
@@ -75,16 +180,35 @@ class WCFormatter:
         self.config = config or {}
         
         # Загружаем маппинг полей
-        self.field_mapping = self._load_field_mapping()
+        self.field_mapping = dict(self._load_field_mapping())
+        
+        # Дата публикации по умолчанию из конфига (разбирается один раз, а не на каждый товар)
+        self._post_date_start = (
+            self.config.get("wc", {}).get("default_values", {}).get("post_date_start", "")
+        )
+        
+        # Базовое время для дат публикации (фиксируется на время пачки)
+        self._batch_base_ts: Optional[int] = None
+        
+        # Пул процессов форматирования (создается при первом использовании и
+        # переиспользуется между выгрузками) и число процессов в нем
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_workers: Optional[int] = None
     
-    def _load_field_mapping(self) -> Dict[str, str]:
-        """Загрузка маппинга полей из конфига"""
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _load_field_mapping() -> Dict[str, str]:
+        """
+        Загрузка маппинга полей из конфига
+        
+        Файл читается один раз на процесс, все форматтеры получают копию результата.
+        """
         try:
             with open("config/wc_fields.json", "r", encoding="utf-8") as f:
                 wc_config = json.load(f)
                 return wc_config.get("field_mapping", {})
         except:
-            self.logger.warning("Не удалось загрузить wc_fields.json, используется маппинг по умолчанию")
+            get_logger().warning("Не удалось загрузить wc_fields.json, используется маппинг по умолчанию")
             return {}
     
     def format_product(self, product: Product) -> Dict[str, str]:
@@ -98,18 +222,21 @@ class WCFormatter:
             Словарь с полями для CSV строки
         """
         try:
-            self.logger.debug(f"Форматирование товара #{product.id} для WC")
+            self.logger.debug("Форматирование товара #%s для WC", product.id)
             
             # Начинаем с пустого словаря
-            csv_row = {field: "" for field in self.WC_CSV_FIELDS}
+            csv_row = self._EMPTY_ROW_TEMPLATE.copy()
             
             # 1. Заполняем основные поля из wc_fields товара
+            has_empty_attributes = False
             for wc_field, value in product.wc_fields.items():
                 if wc_field in csv_row:
                     csv_row[wc_field] = self._format_value(value)
                 elif wc_field.startswith("attribute:pa_"):
                     # Атрибуты добавляем динамически
-                    csv_row[wc_field] = self._format_value(value)
+                    value = self._format_value(value)
+                    csv_row[wc_field] = value
+                    has_empty_attributes = has_empty_attributes or not value
             
             # 2. Заполняем обязательные поля если их нет
             self._fill_required_fields(csv_row, product)
@@ -129,8 +256,11 @@ class WCFormatter:
             # 7. Обрабатываем дополнительные поля
             self._process_extra_fields(csv_row, product)
             
-            # 8. Убираем пустые атрибуты (чтобы не засорять CSV)
-            self._clean_empty_attributes(csv_row)
+            # 8. Убираем пустые атрибуты (чтобы не засорять CSV). Пустые
+            # атрибуты приходят только из wc_fields (шаг 1), поэтому без них
+            # повторный проход по строке не нужен
+            if has_empty_attributes:
+                self._clean_empty_attributes(csv_row)
             
             return csv_row
             
@@ -174,23 +304,22 @@ class WCFormatter:
         if value is None:
             return ""
         
-        value_str = str(value)
+        value_str = value if type(value) is str else str(value)
         
-        # 1. Заменяем HTML-сущности на читаемые символы
-        html_entities = {'&nbsp;': ' ', '&plusmn;': '±', '&deg;': '°'}
-        for entity, replacement in html_entities.items():
-            value_str = value_str.replace(entity, replacement)
+        # 1. Заменяем HTML-сущности на читаемые символы (за один проход)
+        if '&' in value_str:
+            value_str = _RE_HTML_ENTITY.sub(lambda match: _HTML_ENTITIES[match.group()], value_str)
         
         # 2. "Чистим" разрывы строк: заменяем 3+ подряд на 2
-        import re
-        value_str = re.sub(r'\n{3,}', '\n\n', value_str)
+        value_str = _RE_MANY_NL.sub('\n\n', value_str)
         
         # 3. Экранируем двойные кавычки (ПРАВИЛО CSV)
-        value_str = value_str.replace('"', '""')
+        if '"' in value_str:
+            value_str = value_str.replace('"', '""')
         
         # 4. Проверяем, нужно ли оборачивать ячейку в кавычки
-        #    (если есть запятая, кавычка или перенос строки)
-        if ',' in value_str or '"' in value_str or '\n' in value_str:
+        #    (если есть запятая, кавычка или перенос строки) - за один проход
+        if _RE_CSV_SPECIAL.search(value_str):
             value_str = f'"{value_str}"'
         
         return value_str    
@@ -201,37 +330,16 @@ class WCFormatter:
         if not csv_row["ID"]:
             csv_row["ID"] = str(product.id)
         
-        # Название
-        if not csv_row["post_title"] and product.name:
-            csv_row["post_title"] = product.name
-        
-        # Slug
-        if not csv_row["post_name"] and product.wc_slug:
-            csv_row["post_name"] = product.wc_slug
-        
-        # Описание
-        if not csv_row["post_content"] and product.description_final:
-            csv_row["post_content"] = product.description_final
+        # Название, slug, описание, SKU, цена, категория, бренд
+        for wc_field, attr_name, formatter in self._REQUIRED_FILLERS:
+            if not csv_row[wc_field]:
+                value = getattr(product, attr_name)
+                if value:
+                    csv_row[wc_field] = formatter(value) if formatter else value
         
         # Короткое описание
         if not csv_row["post_excerpt"] and product.wc_fields.get("post_excerpt"):
             csv_row["post_excerpt"] = product.wc_fields["post_excerpt"]
-        
-        # SKU
-        if not csv_row["sku"] and product.sku:
-            csv_row["sku"] = product.sku
-        
-        # Цена
-        if not csv_row["regular_price"] and product.price:
-            csv_row["regular_price"] = f"{product.price:.2f}"
-        
-        # Категория
-        if not csv_row["tax:product_cat"] and product.category_hierarchy:
-            csv_row["tax:product_cat"] = " > ".join(product.category_hierarchy)
-        
-        # Бренд
-        if not csv_row["tax:product_brand"] and product.brand:
-            csv_row["tax:product_brand"] = product.brand
     
     def _process_images(self, csv_row: Dict[str, str], product: Product):
         """Обработка изображений"""
@@ -250,18 +358,22 @@ class WCFormatter:
     def _process_categories(self, csv_row: Dict[str, str], product: Product):
         """Обработка категорий"""
         # Убедимся что категория в правильном формате
-        if csv_row["tax:product_cat"]:
-            # Заменяем разные разделители на стандартный " > "
-            cat_str = csv_row["tax:product_cat"]
-            separators = ['-', '–', '—', '/', '\\', '|']
-            for sep in separators:
-                cat_str = cat_str.replace(sep, ' > ')
-            
-            # Убираем множественные " > "
-            while ' >  > ' in cat_str:
-                cat_str = cat_str.replace(' >  > ', ' > ')
-            
+        cat_str = csv_row["tax:product_cat"]
+        if not cat_str:
+            return
+        
+        # Быстрый путь: категория уже только со стандартным разделителем
+        if not _RE_CAT_SEP.search(cat_str) and not _RE_CAT_MULTI.search(cat_str):
             csv_row["tax:product_cat"] = cat_str.strip()
+            return
+        
+        # Заменяем разные разделители на стандартный " > "
+        cat_str = _RE_CAT_SEP.sub(' > ', cat_str)
+        
+        # Убираем множественные " > " (за один проход)
+        cat_str = _RE_CAT_MULTI.sub(' > ', cat_str)
+        
+        csv_row["tax:product_cat"] = cat_str.strip()
     
     def _process_attributes(self, csv_row: Dict[str, str], product: Product):
         """Обработка атрибутов из характеристик"""
@@ -270,59 +382,52 @@ class WCFormatter:
         
         # Добавляем основные атрибуты
         for attr_name, attr_value in product.main_attributes.items():
-            # Генерируем slug для имени атрибута
-            attr_slug = self._slugify_attribute(attr_name)
-            field_name = f"attribute:pa_{attr_slug}"
+            # Поле WC для имени атрибута (вычисляется один раз на имя)
+            field_name = self._attribute_field_name(attr_name)
             
-            # Добавляем поле если его еще нет
-            if field_name not in csv_row:
+            # Добавляем поле если его еще нет (пустые значения не добавляем)
+            if attr_value and field_name not in csv_row:
                 csv_row[field_name] = attr_value
 
 
     # Словарь для сокращения часто используемых слов
             
     
-    def _slugify_attribute(self, text: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _attribute_field_name(attr_name: str) -> str:
+        """
+        Имя поля CSV для атрибута ("Цвет корпуса" -> "attribute:pa_tsvet-korpusa")
+        
+        Результат кешируется: имена атрибутов повторяются от товара к товару.
+        """
+        return sys.intern(f"attribute:pa_{WCFormatter._slugify_attribute(attr_name)}")
+    
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _slugify_attribute(text: str) -> str:
         """
         Генерация slug для имени атрибута с ограничением длины
         
+        Результат зависит только от текста, поэтому кешируется:
+        словарь имен атрибутов в каталоге невелик.
+        
         Args:
             text: Исходный текст
         
         Returns:
             Slug для использования в имени поля (макс 27 символов)
         """
-        import re
-        
         # Если текст пустой
         if not text or not text.strip():
-            return f"attr_{hash(text) % 1000:04d}"
-        
-        # 1. Транслитерация кириллицы (упрощенная)
-        translit_map = {
-            'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd',
-            'е': 'e', 'ё': 'e', 'ж': 'zh', 'з': 'z', 'и': 'i',
-            'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n',
-            'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't',
-            'у': 'u', 'ф': 'f', 'х': 'h', 'ц': 'ts', 'ч': 'ch',
-            'ш': 'sh', 'щ': 'sch', 'ъ': '', 'ы': 'y', 'ь': '',
-            'э': 'e', 'ю': 'yu', 'я': 'ya',
-        }
-        
-        # Приводим к нижнему регистру
-        text_lower = text.lower()
+            return f"attr_{_short_hash(text or '')}"
         
-        # Транслитерируем
-        transliterated = ""
-        for char in text_lower:
-            if char in translit_map:
-                transliterated += translit_map[char]
-            else:
-                transliterated += char
+        # 1. Транслитерация кириллицы (в нижнем регистре, за один проход)
+        transliterated = text.lower().translate(_TRANSLIT_TABLE)
         
         # 2. Убираем все кроме букв, цифр и дефиса
-        slug = re.sub(r'[^\w\s-]', '', transliterated)
-        slug = re.sub(r'[-\s]+', '-', slug)
+        slug = _RE_NONWORD.sub('', transliterated)
+        slug = _RE_SEP.sub('-', slug)
         slug = slug.strip('-')
         
         # 3. СОКРАЩАЕМ ДЛИННЫЕ SLUG (макс 27 символов!)
@@ -361,13 +466,10 @@ class WCFormatter:
         # 4. Если slug пустой - генерируем короткий
         if not slug:
             # Создаем короткий slug на основе хеша
-            import hashlib
-            hash_obj = hashlib.md5(text.encode('utf-8'))
-            hash_hex = hash_obj.hexdigest()[:6]
-            slug = f"attr_{hash_hex}"
+            slug = f"attr_{_short_hash(text)}"
         
         # 5. Убеждаемся что нет двойных дефисов
-        slug = re.sub(r'--+', '-', slug)
+        slug = _RE_DBLDASH.sub('-', slug)
         
         return slug.lower()
 
@@ -378,19 +480,16 @@ class WCFormatter:
         """Обработка дат публикации"""
         # Дата публикации (по умолчанию из конфига или текущая)
         if not csv_row["post_date"]:
-            default_dates = self.config.get("wc", {}).get("default_values", {})
-            post_date_start = default_dates.get("post_date_start", "")
-            
-            if post_date_start:
-                csv_row["post_date"] = post_date_start
+            if self._post_date_start:
+                csv_row["post_date"] = self._post_date_start
             else:
                 # Генерируем последовательные даты чтобы товары не публиковались все сразу
-                import time
-                base_timestamp = int(time.time())
+                base_timestamp = self._batch_base_ts
+                if base_timestamp is None:
+                    base_timestamp = int(time.time())
                 offset = int(csv_row.get("ID", 0)) * 60  # 1 минута между товарами
                 publish_time = base_timestamp + offset
                 
-                from datetime import datetime
                 csv_row["post_date"] = datetime.fromtimestamp(publish_time).strftime("%Y-%m-%d %H:%M:%S")
     
     def _process_extra_fields(self, csv_row: Dict[str, str], product: Product):
@@ -406,42 +505,41 @@ class WCFormatter:
         
         # Вес и габариты из характеристик
         if product.main_attributes:
-            weight = product.main_attributes.get("Масса товара (нетто)", "")
-            width = product.main_attributes.get("Ширина товара", "")
-            depth = product.main_attributes.get("Глубина товара", "")
-            height = product.main_attributes.get("Высота товара", "")
-            
-            if weight:
-                # Пытаемся извлечь число
-                import re
-                weight_match = re.search(r'(\d+\.?\d*)', weight)
-                if weight_match:
-                    csv_row["weight"] = weight_match.group(1)
-            
-            if width:
-                width_match = re.search(r'(\d+\.?\d*)', width)
-                if width_match:
-                    csv_row["width"] = width_match.group(1)
-            
-            if height:
-                height_match = re.search(r'(\d+\.?\d*)', height)
-                if height_match:
-                    csv_row["height"] = height_match.group(1)
-            
-            if depth:
-                depth_match = re.search(r'(\d+\.?\d*)', depth)
-                if depth_match:
-                    csv_row["length"] = depth_match.group(1)  # В WC длина = глубина
+            for attr_name, wc_field in self._DIMENSION_FIELDS:
+                value = product.main_attributes.get(attr_name, "")
+                if value:
+                    # Пытаемся извлечь число
+                    number = _first_number(value)
+                    if number:
+                        csv_row[wc_field] = number
     
     def _clean_empty_attributes(self, csv_row: Dict[str, str]):
         """Удаление пустых атрибутов из CSV строки"""
-        # Находим все атрибуты
-        attr_fields = [field for field in csv_row.keys() if field.startswith("attribute:pa_")]
+        # Находим пустые атрибуты за один проход (пришли из wc_fields)
+        empty_attr_fields = [
+            field for field, value in csv_row.items()
+            if not value and field.startswith("attribute:pa_")
+        ]
+        
+        # Удаляем их
+        for attr_field in empty_attr_fields:
+            del csv_row[attr_field]
+    
+    def _slugify_attribute_names(self, products: List[Product]) -> Dict[str, str]:
+        """
+        Slug для всех уникальных имен атрибутов товаров (каждое имя - один раз)
+        
+        Args:
+            products: Список товаров
+        
+        Returns:
+            Словарь {имя атрибута: slug}
+        """
+        unique_names = set()
+        for product in products:
+            unique_names.update(product.main_attributes.keys())
         
-        # Удаляем пустые
-        for attr_field in attr_fields:
-            if not csv_row[attr_field]:
-                del csv_row[attr_field]
+        return {name: self._slugify_attribute(name) for name in unique_names}
     
     def get_csv_headers(self, products: List[Product] = None) -> List[str]:
         """
@@ -461,100 +559,202 @@ class WCFormatter:
         
         # Если есть товары - добавляем их уникальные атрибуты
         if products:
-            all_attributes = set()
-            for product in products:
-                for attr_name in product.main_attributes.keys():
-                    attr_slug = self._slugify_attribute(attr_name)
-                    field_name = f"attribute:pa_{attr_slug}"
-                    all_attributes.add(field_name)
+            attr_slugs = self._slugify_attribute_names(products)
+            all_attributes = {sys.intern(f"attribute:pa_{attr_slug}") for attr_slug in attr_slugs.values()}
             
-            # Добавляем уникальные атрибуты
-            for attr_field in sorted(all_attributes):
-                if attr_field not in headers:
-                    headers.append(attr_field)
+            # Добавляем уникальные атрибуты (проверка наличия - разностью
+            # множеств, а не поиском по списку для каждого атрибута)
+            headers.extend(sorted(all_attributes.difference(headers)))
         
         return headers
     
-    def format_products_batch(self, products: List[Product]) -> List[Dict[str, str]]:
+    def format_products_batch(
+        self,
+        products: List[Product],
+        max_workers: Optional[int] = None
+    ) -> List[Dict[str, str]]:
         """
         Форматирование пачки товаров
         
         Args:
             products: Список товаров
+            max_workers: Количество процессов для форматирования
+                (None - из конфига processing.format_workers, 1 - без пула)
         
         Returns:
             Список отформатированных строк для CSV
         """
-        formatted_rows = []
+        formatted_rows = list(self.iter_format_products(products, max_workers))
         
-        for product in products:
-            try:
-                # 1. Форматируем товар
-                csv_row = self.format_product(product)
-                
-                # 2. Проверяем что получены данные
-                if not csv_row or not isinstance(csv_row, dict):
-                    self.logger.warning(f"Товар #{product.id}: пустой результат форматирования")
-                    continue
-                
-                # 3. Убедимся что есть обязательные поля
-                required_fields_present = all(
-                    csv_row.get(field) for field in ["post_title", "sku", "regular_price"]
-                )
-                
-                if not required_fields_present:
-                    self.logger.warning(f"Товар #{product.id}: отсутствуют обязательные поля")
+        # Логирование итогов
+        self.log_format_summary(len(formatted_rows), len(products))
+        
+        return formatted_rows
+    
+    def log_format_summary(self, formatted_count: int, total: int):
+        """
+        Логирование итогов форматирования пачки
+        
+        Args:
+            formatted_count: Количество отформатированных строк
+            total: Количество товаров в пачке
+        """
+        if not formatted_count:
+            return
+        
+        self.logger.info(f"✅ Форматирование завершено: {formatted_count}/{total} товаров")
+        
+        # Анализ успешности
+        success_rate = (formatted_count / total) * 100 if total else 0
+        if success_rate < 90:
+            self.logger.warning(f"Низкий процент успеха: {success_rate:.1f}%")
+    
+    def iter_format_products(
+        self,
+        products: List[Product],
+        max_workers: Optional[int] = None
+    ) -> Iterator[Dict[str, str]]:
+        """
+        Потоковое форматирование товаров: строки отдаются по мере готовности
+        
+        Args:
+            products: Список товаров
+            max_workers: Количество процессов для форматирования
+                (None - из конфига processing.format_workers, 1 - без пула)
+        
+        Yields:
+            Отформатированные строки для CSV (для ошибочных товаров - минимальные)
+        """
+        if max_workers is None:
+            max_workers = self.config.get("processing", {}).get("format_workers", 1)
+        
+        rows_count = 0
+        self._batch_base_ts = int(time.time())
+        
+        try:
+            format_results = self._map_format_product(products, max_workers)
+            
+            for product, (csv_row, format_error) in zip(products, format_results):
+                try:
+                    # 1. Форматируем товар (ошибка из воркера обрабатывается ниже)
+                    if format_error is not None:
+                        raise format_error
                     
-                    # Заполняем недостающие поля из товара
-                    if not csv_row.get("post_title") and product.name:
-                        csv_row["post_title"] = product.name
-                    if not csv_row.get("sku") and product.sku:
-                        csv_row["sku"] = product.sku
-                    if not csv_row.get("regular_price") and product.price:
-                        csv_row["regular_price"] = f"{product.price:.2f}"
-                
-                # 4. Добавляем в результат
-                formatted_rows.append(csv_row)
+                    # 2. Проверяем что получены данные
+                    if not csv_row or not isinstance(csv_row, dict):
+                        self.logger.warning(f"Товар #{product.id}: пустой результат форматирования")
+                        continue
+                    
+                    # 3. Убедимся что есть обязательные поля
+                    if not all(map(csv_row.get, self._ROW_CHECK_FIELDS)):
+                        self.logger.warning(f"Товар #{product.id}: отсутствуют обязательные поля")
+                        
+                        # Заполняем недостающие поля из товара
+                        for wc_field, attr_name, formatter in self._ROW_CHECK_FILLERS:
+                            if not csv_row.get(wc_field):
+                                value = getattr(product, attr_name)
+                                if value:
+                                    csv_row[wc_field] = formatter(value) if formatter else value
+                    
+                    self.logger.debug("Товар #%s отформатирован для WC", product.id)
+                    
+                except Exception as e:
+                    self.logger.error(f"Ошибка форматирования товара #{product.id}: {e}")
+                    
+                    # Создаем минимальную строку для отладки
+                    rows_count += 1
+                    yield self._fallback_row(product, e)
+                    continue
                 
-                self.logger.debug(f"Товар #{product.id} отформатирован для WC")
+                # 4. Отдаем результат
+                rows_count += 1
+                yield csv_row
                 
                 # 5. Периодический прогресс (каждые 100 товаров)
-                if len(formatted_rows) % 100 == 0:
-                    self.logger.info(f"Отформатировано {len(formatted_rows)} товаров...")
-                
-            except Exception as e:
-                self.logger.error(f"Ошибка форматирования товара #{product.id}: {e}")
-                
-                # Создаем минимальную строку для отладки
-                fallback_row = {
-                    "ID": str(product.id) if product.id else "",
-                    "post_title": product.name[:100] if product.name else f"Ошибка товара #{product.id}",
-                    "sku": product.sku[:50] if product.sku else "",
-                    "regular_price": str(product.price) if product.price else "0",
-                    "post_content": f"Ошибка при форматировании: {str(e)[:200]}",
-                    "tax:product_type": "simple",
-                    "stock_status": "instock"
-                }
-                
-                # Добавляем категорию если есть
-                if product.category_hierarchy:
-                    fallback_row["tax:product_cat"] = " > ".join(product.category_hierarchy)
-                
-                formatted_rows.append(fallback_row)
-                continue
+                if rows_count % 100 == 0:
+                    self.logger.info(f"Отформатировано {rows_count} товаров...")
+        finally:
+            self._batch_base_ts = None
+    
+    def _fallback_row(self, product: Product, error: Exception) -> Dict[str, str]:
+        """
+        Минимальная строка CSV для товара, который не удалось отформатировать
         
-        # Логирование итогов
-        if formatted_rows:
-            self.logger.info(f"✅ Форматирование завершено: {len(formatted_rows)}/{len(products)} товаров")
-            
-            # Анализ успешности
-            success_rate = (len(formatted_rows) / len(products)) * 100 if products else 0
-            if success_rate < 90:
-                self.logger.warning(f"Низкий процент успеха: {success_rate:.1f}%")
+        Args:
+            product: Товар
+            error: Ошибка форматирования
         
-        return formatted_rows
-
-
+        Returns:
+            Строка CSV с базовыми полями и текстом ошибки
+        """
+        fallback_row = {
+            "ID": str(product.id) if product.id else "",
+            "post_title": product.name[:100] if product.name else f"Ошибка товара #{product.id}",
+            "sku": product.sku[:50] if product.sku else "",
+            "regular_price": str(product.price) if product.price else "0",
+            "post_content": f"Ошибка при форматировании: {str(error)[:200]}",
+            "tax:product_type": "simple",
+            "stock_status": "instock"
+        }
+        
+        # Добавляем категорию если есть
+        if product.category_hierarchy:
+            fallback_row["tax:product_cat"] = " > ".join(product.category_hierarchy)
+        
+        return fallback_row
+    
+    def _map_format_product(
+        self,
+        products: List[Product],
+        max_workers: int
+    ) -> Iterator[Tuple[Optional[Dict[str, str]], Optional[Exception]]]:
+        """
+        Форматирование товаров последовательно или в пуле процессов
+        
+        Args:
+            products: Список товаров
+            max_workers: Количество процессов (1 - в текущем процессе)
+        
+        Returns:
+            Итератор кортежей (строка CSV, исключение) в порядке товаров
+        """
+        if max_workers > 1 and len(products) > 1:
+            executor = self._get_executor(max_workers)
+            
+            # Порции по несколько товаров: меньше обменов между процессами,
+            # но товары распределяются по всем процессам
+            chunksize = max(1, min(128, len(products) // (max_workers * 4)))
+            
+            # Форматтер процесса создан инициализатором, с товарами
+            # передается только базовое время пачки
+            yield from executor.map(
+                partial(_format_product_in_worker, self._batch_base_ts),
+                products,
+                chunksize=chunksize
+            )
+        else:
+            for product in products:
+                yield _format_product_safe(self, product)
+    
+    def _get_executor(self, max_workers: int) -> ProcessPoolExecutor:
+        """Получение (с созданием при необходимости) пула процессов форматирования"""
+        if self._executor is None or self._executor_workers != max_workers:
+            self.shutdown_workers()
+            self._executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_format_worker,
+                initargs=(self.config,)
+            )
+            self._executor_workers = max_workers
+        
+        return self._executor
+    
+    def shutdown_workers(self):
+        """Остановка пула процессов форматирования (если он был создан)"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+            self._executor_workers = None
 
     def get_all_csv_headers(self) -> List[str]:
         """
@@ -581,15 +781,11 @@ class WCFormatter:
         Returns:
             Список дополнительных полей (атрибутов)
         """
-        dynamic_headers = set()
+        # Добавляем атрибуты из main_attributes
+        attr_slugs = self._slugify_attribute_names(products)
+        dynamic_headers = {sys.intern(f"attribute:pa_{attr_slug}") for attr_slug in attr_slugs.values()}
         
         for product in products:
-            # Добавляем атрибуты из main_attributes
-            for attr_name in product.main_attributes.keys():
-                attr_slug = self._slugify_attribute(attr_name)
-                field_name = f"attribute:pa_{attr_slug}"
-                dynamic_headers.add(field_name)
-            
             # Добавляем атрибуты из wc_fields
             for field_name in product.wc_fields.keys():
                 if field_name.startswith("attribute:pa_"):
@@ -610,29 +806,39 @@ class WCFormatter:
         if not csv_rows:
             return []
         
-        # Находим все уникальные поля
-        all_fields = set()
-        for row in csv_rows:
-            all_fields.update(row.keys())
+        # Находим все уникальные поля (объединение ключей всех строк одним вызовом)
+        all_fields = set().union(*csv_rows)
         
         # Сортируем поля (сначала базовые, потом атрибуты)
         base_fields = [f for f in self.WC_CSV_FIELDS if f in all_fields]
-        attribute_fields = sorted([f for f in all_fields 
-                                 if f.startswith("attribute:pa_") and f not in base_fields])
-        other_fields = sorted([f for f in all_fields 
-                             if f not in base_fields and f not in attribute_fields])
+        attribute_fields = []
+        other_fields = []
+        for f in all_fields:
+            if f in self._WC_FIELDS_SET:
+                continue
+            if f.startswith("attribute:pa_"):
+                attribute_fields.append(f)
+            else:
+                other_fields.append(f)
+        attribute_fields.sort()
+        other_fields.sort()
         
         all_fields_sorted = base_fields + attribute_fields + other_fields
         
         # Создаем новые строки с одинаковыми полями
-        unified_rows = []
-        for row in csv_rows:
-            new_row = {}
-            for field in all_fields_sorted:
-                new_row[field] = row.get(field, "")
-            unified_rows.append(new_row)
+        # (шаблон задает порядок полей, поверх - значения строки)
+        row_template = dict.fromkeys(all_fields_sorted, "")
+        return [row_template | row for row in csv_rows]
+    
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _product_attr_name(field_name: str) -> str:
+        """
+        Имя атрибута Product, соответствующее полю WC ("tax:product_cat" -> "product_cat")
         
-        return unified_rows
+        Результат кешируется: набор полей WC фиксирован.
+        """
+        return field_name.replace("tax:", "").replace("attribute:pa_", "")
     
     def generate_field_mapping_report(self, products: List[Product]) -> Dict[str, Any]:
         """
@@ -655,24 +861,30 @@ class WCFormatter:
         # Анализируем базовые поля
         for field in self.WC_CSV_FIELDS:
             count = 0
+            attr_name = self._product_attr_name(field)
+            
+            # Есть ли у Product одноименный атрибут - не зависит от товара,
+            # поэтому проверяется один раз на поле, а не на каждый товар
+            get_attr_value = attrgetter(attr_name) if attr_name in self._PRODUCT_FIELDS else None
+            
             for product in products:
-                if (field in product.wc_fields and product.wc_fields[field]) or \
-                   (hasattr(product, field.replace("tax:", "").replace("attribute:pa_", "")) and 
-                    getattr(product, field.replace("tax:", "").replace("attribute:pa_", ""), None)):
+                if product.wc_fields.get(field) or \
+                   (get_attr_value is not None and get_attr_value(product)):
                     count += 1
             
             report["base_fields"][field] = {
                 "count": count,
                 "percentage": (count / len(products) * 100) if products else 0,
-                "required": field in ["post_title", "sku", "regular_price", "post_content"]
+                "required": field in self._REQUIRED_WC_FIELD_NAMES
             }
         
         # Анализируем динамические поля (атрибуты)
         all_attributes = {}
+        attr_slugs = self._slugify_attribute_names(products)
         for product in products:
             for attr_name, attr_value in product.main_attributes.items():
-                attr_slug = self._slugify_attribute(attr_name)
-                field_name = f"attribute:pa_{attr_slug}"
+                attr_slug = attr_slugs[attr_name]
+                field_name = sys.intern(f"attribute:pa_{attr_slug}")
                 
                 if field_name not in all_attributes:
                     all_attributes[field_name] = {
@@ -695,8 +907,7 @@ class WCFormatter:
             }
         
         # Покрытие полей (сколько товаров имеют определенные поля)
-        required_fields = ["post_title", "sku", "regular_price", "post_content"]
-        for field in required_fields:
+        for field in self._REQUIRED_WC_FIELD_NAMES:
             coverage = report["base_fields"].get(field, {}).get("percentage", 0)
             status = "✅ OK" if coverage == 100 else f"⚠️ {coverage:.1f}%"
             report["field_coverage"][field] = status
@@ -710,8 +921,6 @@ class WCFormatter:
         Args:
             output_path: Путь для сохранения шаблона
         """
-        import csv
-        
         # Получаем все заголовки
         headers = self.get_all_csv_headers()
         
@@ -757,14 +966,7 @@ class WCFormatter:
         }
         
         # Проверяем обязательные поля
-        required_fields = [
-            ("post_title", "Название товара"),
-            ("sku", "SKU"),
-            ("regular_price", "Цена"),
-            ("post_content", "Описание"),
-        ]
-        
-        for wc_field, desc in required_fields:
+        for wc_field, desc in self._REQUIRED_WC_FIELDS:
             value = product.wc_fields.get(wc_field, "")
             if not value or str(value).strip() == "":
                 validation["missing_fields"].append(desc)
@@ -805,6 +1007,76 @@ class WCFormatter:
         return validation
 
 
+def _format_product_safe(
+    formatter: WCFormatter,
+    product: Product
+) -> Tuple[Optional[Dict[str, str]], Optional[Exception]]:
+    """
+    Форматирование товара без выброса исключения (пригодно для пула процессов)
+    
+    Args:
+        formatter: Форматтер
+        product: Товар для форматирования
+    
+    Returns:
+        Кортеж (строка CSV или None, исключение или None)
+    """
+    try:
+        return formatter.format_product(product), None
+    except Exception as e:
+        return None, e
+
+
+# Форматтер процесса пула (создается инициализатором один раз на процесс)
+_worker_formatter: Optional[WCFormatter] = None
+
+
+def _init_format_worker(config: Dict[str, Any]):
+    """
+    Инициализация процесса пула форматирования
+    
+    Args:
+        config: Конфигурация форматтера
+    """
+    global _worker_formatter
+    
+    _worker_formatter = WCFormatter(config)
+
+
+def _format_product_in_worker(
+    batch_base_ts: Optional[int],
+    product: Product
+) -> Tuple[Optional[Dict[str, str]], Optional[Exception]]:
+    """
+    Форматирование товара в процессе пула
+    
+    Args:
+        batch_base_ts: Базовое время дат публикации для пачки
+        product: Товар для форматирования
+    
+    Returns:
+        Кортеж (строка CSV или None, исключение или None)
+    """
+    _worker_formatter._batch_base_ts = batch_base_ts
+    return _format_product_safe(_worker_formatter, product)
+
+
+@lru_cache(maxsize=8)
+def _get_shared_formatter(config_key: str) -> WCFormatter:
+    """Общий форматтер для конфигурации (ключ - JSON конфигурации)"""
+    return WCFormatter(json.loads(config_key))
+
+
+def _shared_formatter(config: Optional[Dict[str, Any]]) -> WCFormatter:
+    """
+    Форматтер для быстрых функций: создается один раз на конфигурацию,
+    а не при каждом вызове
+    """
+    if not config:
+        return _get_shared_formatter("{}")
+    return _get_shared_formatter(json.dumps(config, sort_keys=True, ensure_ascii=False, default=str))
+
+
 # Функции для быстрого использования
 def format_product_for_wc(product: Product, config: Dict[str, Any] = None) -> Dict[str, str]:
     """
@@ -817,8 +1089,7 @@ def format_product_for_wc(product: Product, config: Dict[str, Any] = None) -> Di
     Returns:
         Отформатированная строка CSV
     """
-    formatter = WCFormatter(config)
-    return formatter.format_product(product)
+    return _shared_formatter(config).format_product(product)
 
 
 def get_wc_csv_headers(products: List[Product] = None, config: Dict[str, Any] = None) -> List[str]:
@@ -832,5 +1103,4 @@ def get_wc_csv_headers(products: List[Product] = None, config: Dict[str, Any] =
     Returns:
         Список заголовков
     """
-    formatter = WCFormatter(config)
-    return formatter.get_csv_headers(products)
\ No newline at end of file
+    return _shared_formatter(config).get_csv_headers(products)
\ No newline at end of file
@@ -4,13 +4,37 @@
 
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from urllib.parse import urlparse
 import requests
+from requests.adapters import HTTPAdapter
 from .logger import log_error, log_info
 
 
+# Размер блока при потоковом скачивании (1 MiB)
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Таблица замены недопустимых в имени файла символов на '_'
+_INVALID_FILENAME_TABLE = str.maketrans({char: '_' for char in '<>:"/\\|?*'})
+
+# Общая HTTP-сессия: соединения (TCP + TLS) переиспользуются между скачиваниями
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=64))
+_SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=64))
+
+
+def close_session():
+    """
+    Закрытие пула соединений общей HTTP-сессии
+    
+    Сессия остается пригодной: при следующем скачивании соединения откроются заново.
+    """
+    _SESSION.close()
+
+
 def ensure_dir_exists(directory_path: str) -> bool:
     """
     Создание директории если не существует
@@ -29,10 +53,13 @@ def ensure_dir_exists(directory_path: str) -> bool:
         return False
 
 
+@lru_cache(maxsize=4096)
 def get_file_extension(url: str) -> str:
     """
     Получение расширения файла из URL
     
+    Результат кешируется (в пределах процесса): URL в каталоге часто повторяются.
+    
     Args:
         url: URL файла
     
@@ -60,7 +87,8 @@ def download_file(
     url: str,
     save_path: str,
     timeout: int = 30,
-    retries: int = 3
+    retries: int = 3,
+    chunk_size: int = DOWNLOAD_CHUNK_SIZE
 ) -> bool:
     """
     Скачивание файла по URL
@@ -70,26 +98,29 @@ def download_file(
         save_path: Путь для сохранения
         timeout: Таймаут в секундах
         retries: Количество попыток
+        chunk_size: Размер блока записи в байтах
     
     Returns:
         True если файл успешно скачан
     """
+    # Создаем директорию если не существует (одна и та же для всех попыток)
+    save_dir = os.path.dirname(save_path)
+    if save_dir:
+        ensure_dir_exists(save_dir)
+    
     for attempt in range(retries):
         try:
             log_info(f"Скачивание {url} -> {save_path} (попытка {attempt + 1}/{retries})")
             
-            response = requests.get(url, timeout=timeout, stream=True)
-            response.raise_for_status()
-            
-            # Создаем директорию если не существует
-            save_dir = os.path.dirname(save_path)
-            ensure_dir_exists(save_dir)
-            
-            # Сохраняем файл
-            with open(save_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
+            # with возвращает соединение в пул сессии в любом случае
+            with _SESSION.get(url, timeout=timeout, stream=True) as response:
+                response.raise_for_status()
+                
+                # Сохраняем файл: копирование блоками без генератора iter_content
+                # (decode_content - распаковка gzip/deflate, как в iter_content)
+                response.raw.decode_content = True
+                with open(save_path, 'wb') as f:
+                    shutil.copyfileobj(response.raw, f, chunk_size)
             
             log_info(f"Файл успешно скачан: {save_path}")
             return True
@@ -104,6 +135,29 @@ def download_file(
     return False
 
 
+def download_files(jobs: List[Tuple[str, str]], max_workers: int = 16) -> List[bool]:
+    """
+    Параллельное скачивание нескольких файлов
+    
+    Потоки используют общую HTTP-сессию (pool_maxsize >= max_workers).
+    
+    Args:
+        jobs: Список пар (URL файла, путь для сохранения)
+        max_workers: Максимальное количество потоков
+    
+    Returns:
+        Список результатов download_file в порядке jobs
+    """
+    if not jobs:
+        return []
+    
+    if len(jobs) == 1:
+        return [download_file(*jobs[0])]
+    
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+        return list(executor.map(lambda job: download_file(*job), jobs))
+
+
 def clean_filename(filename: str, max_length: int = 255) -> str:
     """
     Очистка имени файла от недопустимых символов
@@ -115,10 +169,8 @@ def clean_filename(filename: str, max_length: int = 255) -> str:
     Returns:
         Очищенное имя файла
     """
-    # Заменяем недопустимые символы
-    invalid_chars = '<>:"/\\|?*'
-    for char in invalid_chars:
-        filename = filename.replace(char, '_')
+    # Заменяем недопустимые символы (один проход по строке)
+    filename = filename.translate(_INVALID_FILENAME_TABLE)
     
     # Убираем лишние пробелы
     filename = ' '.join(filename.split())
@@ -145,17 +197,22 @@ def get_files_in_directory(directory: str, extensions: Optional[List[str]] = Non
     if not os.path.exists(directory):
         return []
     
+    # Нормализуем расширения один раз (быстрая проверка принадлежности)
+    allowed = frozenset(ext.lower().lstrip('.') for ext in extensions) if extensions else None
+    
     files = []
-    for item in os.listdir(directory):
-        item_path = os.path.join(directory, item)
-        
-        if os.path.isfile(item_path):
-            if extensions:
-                _, ext = os.path.splitext(item)
-                if ext.lower().lstrip('.') in extensions:
-                    files.append(item_path)
-            else:
-                files.append(item_path)
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            # Тип файла берется из данных каталога, без отдельного stat
+            if not entry.is_file():
+                continue
+            
+            if allowed is not None:
+                _, ext = os.path.splitext(entry.name)
+                if ext.lower().lstrip('.') not in allowed:
+                    continue
+            
+            files.append(entry.path)
     
     return files
 
@@ -2,10 +2,64 @@
 Утилита для логирования
 """
 
+import atexit
 import logging
+import os
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
+
+
+# Фоновые потоки записи логов в файл (по имени логгера)
+_queue_listeners: Dict[str, QueueListener] = {}
+
+
+def shutdown_logger(name: str = "b2b_wc_converter"):
+    """
+    Остановка фоновой записи логов в файл
+    
+    Дожидается записи всех накопленных сообщений. Вызывается автоматически
+    при завершении процесса и при повторной настройке логгера.
+    
+    Args:
+        name: Имя логгера
+    """
+    listener = _queue_listeners.pop(name, None)
+    if listener is not None:
+        listener.stop()
+
+
+def _shutdown_all_loggers():
+    """Остановка всех фоновых потоков записи логов"""
+    for name in list(_queue_listeners):
+        shutdown_logger(name)
+
+
+def _restore_file_handlers_after_fork():
+    """
+    Прямая запись логов в файл в дочернем процессе (fork)
+    
+    Поток QueueListener при fork не копируется: записи из очереди в дочернем
+    процессе никто не читал бы, и они не попадали бы в файл. Поэтому
+    QueueHandler заменяется файловыми обработчиками слушателя.
+    """
+    for name, listener in list(_queue_listeners.items()):
+        del _queue_listeners[name]
+        logger = logging.getLogger(name)
+        
+        for handler in logger.handlers[:]:
+            if isinstance(handler, QueueHandler):
+                logger.removeHandler(handler)
+        
+        for file_handler in listener.handlers:
+            logger.addHandler(file_handler)
+
+
+atexit.register(_shutdown_all_loggers)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restore_file_handlers_after_fork)
 
 
 def setup_logger(
@@ -31,7 +85,8 @@ def setup_logger(
     logger = logging.getLogger(name)
     logger.setLevel(getattr(logging, log_level.upper()))
     
-    # Очищаем существующие обработчики
+    # Очищаем существующие обработчики (и останавливаем фоновую запись)
+    shutdown_logger(name)
     logger.handlers.clear()
     
     # Форматтер
@@ -54,7 +109,15 @@ def setup_logger(
         
         file_handler = logging.FileHandler(log_file, encoding='utf-8')
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        
+        # Запись в файл выполняет фоновый поток: вызывающий код только
+        # ставит запись в очередь и не ждет диска. Консоль остается
+        # синхронной, чтобы сообщения не перемешивались с выводом print
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+        listener.start()
+        _queue_listeners[name] = listener
+        logger.addHandler(QueueHandler(log_queue))
     
     return logger
 
@@ -66,6 +129,9 @@ _logger_instance = None
 def get_logger() -> logging.Logger:
     """
     Получение глобального логгера
+    
+    Хелперы log_* обращаются к _logger_instance напрямую и вызывают
+    get_logger() только до первой инициализации.
     """
     global _logger_instance
     
@@ -84,12 +150,31 @@ def log_product_processed(product_id: int, product_name: str, success: bool = Tr
         product_name: Название товара
         success: Успешно ли обработан
     """
-    logger = get_logger()
+    logger = _logger_instance or get_logger()
     status = "✅" if success else "❌"
-    logger.info(f"{status} Товар #{product_id}: {product_name}")
+    logger.info("%s Товар #%s: %s", status, product_id, product_name)
+
+
+def batch_milestones(total: int, batch_size: int = 50) -> frozenset:
+    """
+    Номера товаров, на которых логируется прогресс
+    
+    Args:
+        total: Общее количество товаров
+        batch_size: Размер пачки
+    
+    Returns:
+        Множество номеров: каждый batch_size-й и последний
+    """
+    return frozenset(range(batch_size, total + 1, batch_size)) | {total}
 
 
-def log_batch_progress(current: int, total: int, batch_size: int = 50):
+def log_batch_progress(
+    current: int,
+    total: int,
+    batch_size: int = 50,
+    milestones: Optional[frozenset] = None
+):
     """
     Логирование прогресса обработки пачки
     
@@ -97,12 +182,18 @@ def log_batch_progress(current: int, total: int, batch_size: int = 50):
         current: Текущий номер товара
         total: Общее количество товаров
         batch_size: Размер пачки
-    """
-    logger = get_logger()
+        milestones: Заранее вычисленные номера для логирования
+                    (см. batch_milestones), заменяют проверку по batch_size
+    """
+    if milestones is not None:
+        if current not in milestones:
+            return
+    elif current % batch_size and current != total:
+        return
     
-    if current % batch_size == 0 or current == total:
-        percent = (current / total) * 100
-        logger.info(f"📊 Прогресс: {current}/{total} ({percent:.1f}%)")
+    logger = _logger_instance or get_logger()
+    percent = (current / total) * 100
+    logger.info("📊 Прогресс: %d/%d (%.1f%%)", current, total, percent)
 
 
 def log_error(error_msg: str, exc_info: bool = False):
@@ -113,7 +204,7 @@ def log_error(error_msg: str, exc_info: bool = False):
         error_msg: Сообщение об ошибке
         exc_info: Логировать traceback
     """
-    logger = get_logger()
+    logger = _logger_instance or get_logger()
     logger.error(error_msg, exc_info=exc_info)
 
 
@@ -121,21 +212,28 @@ def log_warning(warning_msg: str):
     """
     Логирование предупреждения
     """
-    logger = get_logger()
-    logger.warning(f"⚠️ {warning_msg}")
+    logger = _logger_instance or get_logger()
+    logger.warning("⚠️ %s", warning_msg)
 
 
 def log_info(info_msg: str):
     """
     Логирование информационного сообщения
     """
-    logger = get_logger()
-    logger.info(f"ℹ️ {info_msg}")
+    logger = _logger_instance or get_logger()
+    logger.info("ℹ️ %s", info_msg)
 
 
-def log_debug(debug_msg: str):
+def log_debug(debug_msg: str, *args):
     """
     Логирование отладочного сообщения
-    """
-    logger = get_logger()
-    logger.debug(f"🔍 {debug_msg}")
\ No newline at end of file
+    
+    Args:
+        debug_msg: Сообщение или шаблон в %-стиле (если переданы args)
+        args: Аргументы шаблона - подставляются, только если уровень DEBUG включен
+    """
+    logger = _logger_instance or get_logger()
+    if args:
+        logger.debug("🔍 " + debug_msg, *args)
+    else:
+        logger.debug("🔍 %s", debug_msg)
\ No newline at end of file
@@ -7,6 +7,53 @@ from typing import Optional, Tuple, List
 from .logger import log_error
 
 
+# Предкомпилированные регулярные выражения
+_RE_EMAIL = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_RE_URL = re.compile(r'^https?://[^\s/$.?#].[^\s]*$')
+
+# Таблицы и выражения для очистки цены
+_RE_CURRENCY = re.compile(r'руб\.?|rub\.?|rur\.?|р\.|₽', re.IGNORECASE)
+_PRICE_SKIP_TABLE = str.maketrans('', '', '0123456789. \t\n\r')
+_RE_PRICE_NOT_DIGIT = re.compile(r'[^0-9.]')
+
+# Разделители нескольких штрихкодов в одной ячейке
+_BARCODE_SEPARATORS_TABLE = str.maketrans({sep: '|' for sep in '/,;\\'})
+
+
+def _clean_price_chars(price_str: str, errors: List[str]) -> str:
+    """
+    Посимвольная очистка цены (медленный путь для нестандартных символов)
+    
+    Args:
+        price_str: Строка с ценой без валютных обозначений
+        errors: Список ошибок, дополняется недопустимыми символами
+    
+    Returns:
+        Строка из цифр и не более одной точки
+    """
+    cleaned = []
+    has_decimal = False
+    
+    for char in price_str:
+        if char.isdigit():
+            cleaned.append(char)
+        elif char in ',.' and not has_decimal:
+            # Заменяем запятую на точку
+            cleaned.append('.')
+            has_decimal = True
+        elif char in ' \t\n\r':
+            # Игнорируем пробелы
+            continue
+        elif char.isalpha():
+            # Игнорируем буквы (уже убрали валютные обозначения)
+            continue
+        else:
+            # Другие символы - ошибка
+            errors.append(f"Недопустимый символ в цене: '{char}'")
+    
+    return ''.join(cleaned)
+
+
 def validate_price(price_str: str) -> Tuple[Optional[float], List[str]]:
     """
     Валидация и очистка цены
@@ -19,53 +66,30 @@ def validate_price(price_str: str) -> Tuple[Optional[float], List[str]]:
     """
     errors = []
     
-    if not price_str or str(price_str).strip() == "":
+    # Приводим к строке один раз (пустое значение - пустая строка)
+    price_str = str(price_str).strip() if price_str else ""
+    
+    if not price_str:
         errors.append("Цена не указана")
         return None, errors
     
     try:
-        # Приводим к строке
-        price_str = str(price_str).strip()
-        
         # Убираем все пробелы (разделители тысяч)
         price_str = price_str.replace(" ", "")
         
         # Заменяем запятую на точку (десятичный разделитель)
         price_str = price_str.replace(",", ".")
         
-
-        # Убираем все нецифровые символы кроме точки и запятой
-        # Игнорируем "руб.", "RUB", "₽" и другие валютные обозначения
-        cleaned = ""
-        has_decimal = False
-        
-        # Список игнорируемых валютных обозначений
-        currency_words = ["руб", "rub", "rur", "р.", "₽", "руб.", "rub.", "rur."]
+        # Убираем "руб.", "RUB", "₽" и другие валютные обозначения (вместе с точкой)
+        price_str = _RE_CURRENCY.sub("", price_str)
         
-        # Проверяем наличие валютных обозначений
-        price_lower = price_str.lower()
-        for currency in currency_words:
-            if currency in price_lower:
-                # Убираем валютное обозначение
-                price_str = price_str.lower().replace(currency, "")
-        
-        for char in price_str:
-            if char.isdigit():
-                cleaned += char
-            elif char in ',.' and not has_decimal:
-                # Заменяем запятую на точку
-                cleaned += '.'
-                has_decimal = True
-            elif char in ' \t\n\r':
-                # Игнорируем пробелы
-                continue
-            elif char.isalpha():
-                # Игнорируем буквы (уже убрали валютные обозначения)
-                continue
-            else:
-                # Другие символы - ошибка
-                errors.append(f"Недопустимый символ в цене: '{char}'")
-
+        # Быстрый путь: только ASCII-цифры, одна точка, пробелы и буквы —
+        # очистка одним проходом на уровне C, без посимвольного цикла
+        rest = price_str.translate(_PRICE_SKIP_TABLE)
+        if price_str.count('.') <= 1 and (not rest or rest.isalpha()):
+            cleaned = _RE_PRICE_NOT_DIGIT.sub('', price_str)
+        else:
+            cleaned = _clean_price_chars(price_str, errors)
         
         if not cleaned:
             errors.append("Цена не содержит цифр")
@@ -102,12 +126,13 @@ def validate_sku(sku_str: str) -> Tuple[Optional[str], List[str]]:
     """
     errors = []
     
-    if not sku_str or str(sku_str).strip() == "":
+    # Приводим к строке один раз (пустое значение - пустая строка)
+    sku = str(sku_str).strip() if sku_str else ""
+    
+    if not sku:
         errors.append("SKU не указан")
         return None, errors
     
-    sku = str(sku_str).strip()
-    
     # Проверяем длину
     if len(sku) < 2:
         errors.append(f"SKU слишком короткий: '{sku}'")
@@ -147,16 +172,15 @@ def validate_barcode(barcode_str: str) -> Tuple[Optional[str], List[str]]:
     """
     errors = []
     
-    if not barcode_str or str(barcode_str).strip() == "":
+    # Приводим к строке один раз (пустое значение - пустая строка)
+    barcode_str = str(barcode_str).strip() if barcode_str else ""
+    
+    if not barcode_str:
         # Штрихкод не обязателен, возвращаем пустую строку
         return "", []
     
-    barcode_str = str(barcode_str).strip()
-    
     # Разделяем по возможным разделителям
-    separators = ['/', ',', ';', '\\', '|']
-    for sep in separators:
-        barcode_str = barcode_str.replace(sep, '|')
+    barcode_str = barcode_str.translate(_BARCODE_SEPARATORS_TABLE)
     
     parts = [part.strip() for part in barcode_str.split('|') if part.strip()]
     
@@ -166,8 +190,11 @@ def validate_barcode(barcode_str: str) -> Tuple[Optional[str], List[str]]:
     # Берем первую часть
     first_barcode = parts[0]
     
-    # Очищаем от нецифровых символов
-    digits_only = ''.join(filter(str.isdigit, first_barcode))
+    # Очищаем от нецифровых символов (обычно штрихкод уже состоит из цифр)
+    if first_barcode.isdigit():
+        digits_only = first_barcode
+    else:
+        digits_only = ''.join(filter(str.isdigit, first_barcode))
     
     if not digits_only:
         errors.append(f"Штрихкод не содержит цифр: '{first_barcode}'")
@@ -187,8 +214,7 @@ def validate_email(email: str) -> bool:
     if not email:
         return False
     
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    return bool(_RE_EMAIL.match(email))
 
 
 def validate_url(url: str) -> bool:
@@ -198,8 +224,7 @@ def validate_url(url: str) -> bool:
     if not url:
         return False
     
-    pattern = r'^https?://[^\s/$.?#].[^\s]*$'
-    return bool(re.match(pattern, url))
+    return bool(_RE_URL.match(url))
 
 
 def validate_required(value, field_name: str) -> List[str]: